@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+CACHE_DIRNAME = ".workman"
+
+
+def get_user_cache_dir() -> Path:
+    """Return the per-user workman cache directory (not created here).
+
+    WORKMAN_CACHE_DIR wins if set; otherwise $XDG_CACHE_HOME/workman, falling
+    back to ~/.cache/workman.
+    """
+    override = os.environ.get("WORKMAN_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "workman"
+
+
+def get_cache_dir(workspace_root: Path, name: str) -> Path | None:
+    """Return (creating if needed) a cache subdirectory inside the workspace.
+
+    The top-level cache directory carries its own .gitignore so it never shows
+    up in the workspace repo. Returns None if the directory can't be created
+    (e.g. a read-only workspace); callers should then skip caching.
+    """
+    root = workspace_root / CACHE_DIRNAME
+    path = root / name
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+        gitignore = root / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("# Created by workman\n*\n")
+    except OSError:
+        return None
+    return path
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
 
 import click
 
-from workman.config import load_config, resolve_projects
+# Subcommands live in workman.commands.<name> and are only imported when
+# dispatched, so e.g. `wm --help` never pulls in yaml, packaging or urllib.
+COMMANDS = ("build", "clean", "deps", "gitignore", "init", "migrate", "prune", "push", "status")
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules on demand."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *COMMANDS})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in COMMANDS:
+            module = importlib.import_module(f"workman.commands.{cmd_name}")
+            return getattr(module, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup)
 @click.option(
     "-C",
     "workspace",
@@ -20,170 +36,3 @@ def cli(ctx: click.Context, workspace: Path | None) -> None:
     """Workman — manage a workspace of projects."""
     ctx.ensure_object(dict)
     ctx.obj["workspace"] = (workspace or Path.cwd()).resolve()
-
-
-@cli.command()
-@click.pass_context
-def init(ctx: click.Context) -> None:
-    """Scan the workspace and generate a .workman.yaml config file."""
-    from workman.init import init_workspace
-
-    init_workspace(ctx.obj["workspace"])
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.pass_context
-def status(ctx: click.Context, projects: tuple[str, ...]) -> None:
-    """Show git status for repositories in the workspace.
-
-    Optionally specify projects or @groups to filter. Use @all for everything.
-    """
-    from workman.git import show_status
-
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    show_status(ctx.obj["workspace"], names)
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.pass_context
-def build(ctx: click.Context, projects: tuple[str, ...]) -> None:
-    """Build docker images for projects (all if none specified).
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    from workman.docker import build_images
-
-    build_images(ws, names)
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.pass_context
-def push(ctx: click.Context, projects: tuple[str, ...]) -> None:
-    """Push docker images to their registries.
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    from workman.docker import push_images
-
-    push_images(ws, names)
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.pass_context
-def prune(ctx: click.Context, projects: tuple[str, ...]) -> None:
-    """Remove all docker images except the most recent for each project.
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    from workman.docker import prune_images
-
-    prune_images(ws, names)
-
-
-@cli.command()
-@click.pass_context
-def gitignore(ctx: click.Context) -> None:
-    """Update .gitignore to exclude subproject folders from the workspace repo."""
-    ws = load_config(ctx.obj["workspace"])
-    from workman.gitignore import update_gitignore
-
-    update_gitignore(ctx.obj["workspace"], list(ws.projects.keys()))
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.pass_context
-def clean(ctx: click.Context, projects: tuple[str, ...]) -> None:
-    """Remove Python build artifacts from projects.
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    from workman.cleanup import clean_workspace
-
-    clean_workspace(ctx.obj["workspace"], names)
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.option("--clean", is_flag=True, help="Remove legacy files after migration.")
-@click.pass_context
-def migrate(ctx: click.Context, projects: tuple[str, ...], clean: bool) -> None:
-    """Migrate legacy Python projects to pyproject.toml.
-
-    Parses setup.py, setup.cfg, and requirements.txt to generate a complete
-    pyproject.toml with [project] metadata and [build-system] for hatchling.
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    from workman.migrate import migrate_projects
-
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    migrate_projects(ctx.obj["workspace"], names, clean=clean)
-
-
-@cli.command()
-@click.argument("projects", nargs=-1)
-@click.option("--fix", is_flag=True, help="Update pyproject.toml files to align versions.")
-@click.option("--outdated", is_flag=True, help="Check PyPI for newer versions.")
-@click.option("--upgrade", is_flag=True, help="Update specifiers to latest PyPI versions.")
-@click.pass_context
-def deps(
-    ctx: click.Context,
-    projects: tuple[str, ...],
-    fix: bool,
-    outdated: bool,
-    upgrade: bool,
-) -> None:
-    """Report and optionally align dependency versions across projects.
-
-    Scans pyproject.toml files in subprojects and reports packages where version
-    specifiers differ. With --fix, aligns to the highest >= lower bound found.
-
-    Use --outdated to check PyPI for newer versions, or --upgrade to also update
-    the specifiers in pyproject.toml.
-
-    Specify projects or @groups. Use @all for everything.
-    """
-    from workman.deps import (
-        align_dependencies,
-        find_mismatches,
-        find_outdated,
-        scan_dependencies,
-        show_outdated_report,
-        show_report,
-        upgrade_dependencies,
-    )
-
-    ws = load_config(ctx.obj["workspace"])
-    names = resolve_projects(ws, projects)
-    packages = scan_dependencies(ctx.obj["workspace"], names)
-
-    if outdated or upgrade:
-        click.echo("Checking PyPI for updates:\n")
-        outdated_pkgs = find_outdated(packages)
-        show_outdated_report(outdated_pkgs)
-
-        if upgrade and outdated_pkgs:
-            click.echo("Upgrading dependencies:\n")
-            upgrade_dependencies(ctx.obj["workspace"], packages, outdated_pkgs)
-    else:
-        mismatches = find_mismatches(packages)
-        show_report(mismatches)
-
-        if fix and mismatches:
-            click.echo("Aligning dependencies:\n")
-            align_dependencies(ctx.obj["workspace"], mismatches)
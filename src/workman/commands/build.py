@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.option("--bake", is_flag=True, help="Build all images in one `docker buildx bake` run.")
+@click.option(
+    "--no-cache-from",
+    "no_cache_from",
+    is_flag=True,
+    help="Don't seed the build cache from each image's latest tag.",
+)
+@click.pass_context
+def build(ctx: click.Context, projects: tuple[str, ...], bake: bool, no_cache_from: bool) -> None:
+    """Build docker images for projects (all if none specified).
+
+    With --bake, every image is handed to buildx in a single invocation so
+    targets build concurrently and share cached layers.
+
+    Specify projects or @groups. Use @all for everything.
+    """
+    from workman.config import load_config, resolve_projects
+    from workman.docker import build_images
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+    build_images(ws, names, bake=bake, cache_from=not no_cache_from)
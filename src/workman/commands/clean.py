@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.pass_context
+def clean(ctx: click.Context, projects: tuple[str, ...]) -> None:
+    """Remove Python build artifacts from projects.
+
+    Specify projects or @groups. Use @all for everything.
+    """
+    from workman.cleanup import clean_workspace
+    from workman.config import load_config, resolve_projects
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+    clean_workspace(ctx.obj["workspace"], names)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.option("--fix", is_flag=True, help="Update pyproject.toml files to align versions.")
+@click.option("--outdated", is_flag=True, help="Check PyPI for newer versions.")
+@click.option("--upgrade", is_flag=True, help="Update specifiers to latest PyPI versions.")
+@click.pass_context
+def deps(
+    ctx: click.Context,
+    projects: tuple[str, ...],
+    fix: bool,
+    outdated: bool,
+    upgrade: bool,
+) -> None:
+    """Report and optionally align dependency versions across projects.
+
+    Scans pyproject.toml files in subprojects and reports packages where version
+    specifiers differ. With --fix, aligns to the highest >= lower bound found.
+
+    Use --outdated to check PyPI for newer versions, or --upgrade to also update
+    the specifiers in pyproject.toml.
+
+    Specify projects or @groups. Use @all for everything.
+    """
+    from workman.config import load_config, resolve_projects
+    from workman.deps import (
+        align_dependencies,
+        find_mismatches,
+        scan_and_find_outdated,
+        scan_dependencies,
+        show_outdated_report,
+        show_report,
+        upgrade_dependencies,
+    )
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+
+    if outdated or upgrade:
+        packages, outdated_pkgs = scan_and_find_outdated(ctx.obj["workspace"], names)
+        show_outdated_report(outdated_pkgs)
+
+        if upgrade and outdated_pkgs:
+            click.echo("Upgrading dependencies:\n")
+            upgrade_dependencies(ctx.obj["workspace"], packages, outdated_pkgs)
+    else:
+        packages = scan_dependencies(ctx.obj["workspace"], names)
+        mismatches = find_mismatches(packages)
+        show_report(mismatches)
+
+        if fix and mismatches:
+            click.echo("Aligning dependencies:\n")
+            align_dependencies(ctx.obj["workspace"], mismatches)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.pass_context
+def gitignore(ctx: click.Context) -> None:
+    """Update .gitignore to exclude subproject folders from the workspace repo."""
+    from workman.config import load_config
+    from workman.gitignore import update_gitignore
+
+    ws = load_config(ctx.obj["workspace"])
+    update_gitignore(ctx.obj["workspace"], list(ws.projects.keys()))
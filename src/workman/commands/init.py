@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.pass_context
+def init(ctx: click.Context) -> None:
+    """Scan the workspace and generate a .workman.yaml config file."""
+    from workman.init import init_workspace
+
+    init_workspace(ctx.obj["workspace"])
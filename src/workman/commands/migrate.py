@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.option("--clean", is_flag=True, help="Remove legacy files after migration.")
+@click.pass_context
+def migrate(ctx: click.Context, projects: tuple[str, ...], clean: bool) -> None:
+    """Migrate legacy Python projects to pyproject.toml.
+
+    Parses setup.py, setup.cfg, and requirements.txt to generate a complete
+    pyproject.toml with [project] metadata and [build-system] for hatchling.
+
+    Specify projects or @groups. Use @all for everything.
+    """
+    from workman.config import load_config, resolve_projects
+    from workman.migrate import migrate_projects
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+    migrate_projects(ctx.obj["workspace"], names, clean=clean)
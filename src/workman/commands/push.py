@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.pass_context
+def push(ctx: click.Context, projects: tuple[str, ...]) -> None:
+    """Push docker images to their registries.
+
+    Specify projects or @groups. Use @all for everything.
+    """
+    from workman.config import load_config, resolve_projects
+    from workman.docker import push_images
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+    push_images(ws, names)
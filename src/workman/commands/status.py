@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.argument("projects", nargs=-1)
+@click.pass_context
+def status(ctx: click.Context, projects: tuple[str, ...]) -> None:
+    """Show git status for repositories in the workspace.
+
+    Optionally specify projects or @groups to filter. Use @all for everything.
+    """
+    from workman.config import load_config, resolve_projects
+    from workman.git import show_status
+
+    ws = load_config(ctx.obj["workspace"])
+    names = resolve_projects(ws, projects)
+    show_status(ctx.obj["workspace"], names)
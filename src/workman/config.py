@@ -5,19 +5,24 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
 
 DEFAULT_LATEST_TAG = "latest"
 CONFIG_FILENAME = ".workman.yaml"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImageConfig:
     name: str
     dockerfile: str | None = None  # relative to build context
     context: Path | None = None  # absolute; resolved from workspace root at load time
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProjectConfig:
     name: str
     path: Path
@@ -25,7 +30,7 @@ class ProjectConfig:
     latest_tag: str | None = None  # per-project override
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkspaceConfig:
     root: Path
     latest_tag: str = DEFAULT_LATEST_TAG
@@ -34,19 +39,30 @@ class WorkspaceConfig:
     default_group: str | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class BuildPlan:
+    """Docker-enabled projects selected for a command, with their effective latest tags."""
+    projects: list[ProjectConfig]
+    latest_tags: dict[str, str]  # project name -> latest tag
+
+
 def load_config(workspace_root: Path | None = None) -> WorkspaceConfig:
     """Load .workman.yaml from the workspace root directory."""
     root = (workspace_root or Path.cwd()).resolve()
     config_path = root / CONFIG_FILENAME
 
-    if not config_path.exists():
+    try:
+        return _parse_config(root, config_path)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"No {CONFIG_FILENAME} found in {root}. "
             "Are you in a workman workspace?"
-        )
+        ) from None
+
 
+def _parse_config(root: Path, config_path: Path) -> WorkspaceConfig:
     with open(config_path) as f:
-        raw = yaml.safe_load(f) or {}
+        raw = yaml.load(f, Loader=SafeLoader) or {}
 
     latest_tag = raw.get("latest_tag", DEFAULT_LATEST_TAG)
 
@@ -147,3 +163,12 @@ def get_docker_projects(ws: WorkspaceConfig, names: tuple[str, ...] | None = Non
             )
 
     return result
+
+
+def resolve_build_plan(ws: WorkspaceConfig, names: tuple[str, ...] | None = None) -> BuildPlan:
+    """Select docker projects (as get_docker_projects) and resolve their latest tags once."""
+    projects = get_docker_projects(ws, names)
+    return BuildPlan(
+        projects=projects,
+        latest_tags={p.name: get_effective_latest_tag(ws, p) for p in projects},
+    )
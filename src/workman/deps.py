@@ -1,112 +1,247 @@
 from __future__ import annotations
 
+import http.client
 import json
+import os
 import re
+import threading
+import time
 import tomllib
-import urllib.request
+import urllib.error
+import urllib.parse
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import click
-from packaging.requirements import Requirement
+from packaging.requirements import InvalidRequirement, Requirement
 from packaging.specifiers import SpecifierSet
-from packaging.version import Version
+from packaging.utils import canonicalize_name, parse_sdist_filename, parse_wheel_filename
+from packaging.version import InvalidVersion, Version
+
+from workman.cache import get_cache_dir, get_user_cache_dir
+
+# Bump whenever the shape or meaning of cached scan results changes
+DEPCACHE_VERSION = 2
+SCAN_MAX_WORKERS = 32
+
+# Bare names and single-clause specifiers like "click>=8.0" cover most lines.
+# Anything fancier (extras, markers, URLs, multiple clauses) goes through the
+# full PEP 508 parser.
+_SIMPLE_DEP = re.compile(
+    r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)"
+    r"\s*(?:(==|!=|<=|>=|<|>)\s*(\d+(?:\.\d+)*))?\s*$"
+)
+
+# The same few names recur in every project, so normalize each only once
+_canon = lru_cache(maxsize=8192)(canonicalize_name)
+
+# Locating dependency arrays in pyproject.toml text (see _dependency_spans).
+# The token pattern skips strings and comments so brackets inside them, as in
+# "requests[socks]", don't count towards nesting.
+_TOML_TABLE_HEADER = re.compile(r"^[ \t]*\[([^\[\]\n]+)\][ \t]*(?:#.*)?$", re.M)
+_TOML_DEP_KEY = re.compile(r"^[ \t]*(?:optional-)?dependencies[ \t]*=[ \t]*", re.M)
+_TOML_TOKEN = re.compile(
+    r'"""(?:[^\\]|\\.)*?"""|\'\'\'.*?\'\'\'|"(?:[^"\\\n]|\\.)*"|\'[^\'\n]*\'|#[^\n]*|[\[\]{}]',
+    re.S,
+)
+# Tables whose every value holds dependency strings
+_DEP_TABLES = frozenset({"project.optional-dependencies", "dependency-groups"})
 
 
 def _parse_deps(dep_list: list[str]) -> dict[str, str]:
-    """Parse a list of PEP 508 dependency strings into {name: specifier_string}."""
+    """Parse a list of PEP 508 dependency strings into {name: specifier_string}.
+
+    Names are normalized per PEP 503, so "PyYAML", "pyyaml" and
+    "typing_extensions"/"typing-extensions" are grouped together.
+    """
     result: dict[str, str] = {}
     for dep_str in dep_list:
+        m = _SIMPLE_DEP.match(dep_str)
+        if m:
+            name, op, version = m.groups()
+            result[_canon(name)] = f"{op}{version}" if op else ""
+            continue
+
         try:
             req = Requirement(dep_str)
-        except Exception:
+        except InvalidRequirement:
             continue
-        name = req.name.lower()
-        spec = str(req.specifier)
-        result[name] = spec
+        result[_canon(req.name)] = str(req.specifier)
     return result
 
 
+def _dependency_strings(data: dict) -> list[str]:
+    """Collect the PEP 508 strings from a parsed pyproject.toml.
+
+    Covers [project].dependencies, [project.optional-dependencies], and
+    [dependency-groups]. Entries that aren't strings are skipped.
+    """
+    project = data.get("project", {})
+
+    # Main dependencies
+    deps: list[str] = [d for d in project.get("dependencies", []) if isinstance(d, str)]
+
+    # Optional dependencies
+    for group_deps in project.get("optional-dependencies", {}).values():
+        if isinstance(group_deps, list):
+            deps.extend(d for d in group_deps if isinstance(d, str))
+
+    # Dependency groups (PEP 735 / uv)
+    for group_deps in data.get("dependency-groups", {}).values():
+        if isinstance(group_deps, list):
+            # Filter to plain strings (skip include-group dicts)
+            deps.extend(d for d in group_deps if isinstance(d, str))
+
+    return deps
+
+
+def _parse_pyproject_deps(pyproject: Path) -> dict[str, str] | None:
+    """Parse all dependency specifiers from a pyproject.toml, or None if unreadable."""
+    try:
+        with open(pyproject, "rb") as f:
+            data = tomllib.load(f)
+    except Exception:
+        return None
+
+    return _parse_deps(_dependency_strings(data))
+
+
+def _scan_pyproject(pyproject: Path, cache_dir: Path | None) -> dict[str, str] | None:
+    """Return a pyproject's dependencies, served from cache_dir when unchanged.
+
+    Cache entries are keyed on the file's mtime and size, so any edit to
+    pyproject.toml forces a re-parse.
+    """
+    if cache_dir is None:
+        return _parse_pyproject_deps(pyproject)
+
+    try:
+        st = pyproject.stat()
+    except OSError:
+        return None
+    key = [DEPCACHE_VERSION, st.st_mtime_ns, st.st_size]
+    cache_file = cache_dir / f"{pyproject.parent.name}.json"
+
+    try:
+        cached = json.loads(cache_file.read_text())
+        if cached["key"] == key:
+            return cached["deps"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    all_deps = _parse_pyproject_deps(pyproject)
+    if all_deps is not None:
+        try:
+            cache_file.write_text(json.dumps({"key": key, "deps": all_deps}))
+        except OSError:
+            pass
+    return all_deps
+
+
 def scan_dependencies(
     workspace_root: Path,
     project_names: tuple[str, ...] | None = None,
+    *,
+    on_lower_bound: Callable[[str], None] | None = None,
 ) -> dict[str, dict[str, str]]:
     """Scan pyproject.toml files and return {package: {project: specifier}}.
 
     Scans [project].dependencies, [dependency-groups], and
-    [project.optional-dependencies].
+    [project.optional-dependencies]. Parsed results are cached per project
+    under .workman/depcache and reused until the pyproject.toml changes.
+
+    on_lower_bound, if given, is called (from the calling thread) with each
+    package name as soon as a >= bound for it is seen, possibly repeatedly,
+    while the rest of the workspace is still being scanned.
     """
-    subdirs = sorted(
-        p for p in workspace_root.iterdir()
-        if p.is_dir() and not p.name.startswith(".")
-    )
-    if project_names is not None:
-        subdirs = [d for d in subdirs if d.name in project_names]
+    # DirEntry carries the file type from the directory read, so only
+    # symlinked entries need an extra stat; name filters run before even that
+    with os.scandir(workspace_root) as it:
+        subdirs = sorted(
+            e.name for e in it
+            if not e.name.startswith(".")
+            and (project_names is None or e.name in project_names)
+            and e.is_dir()
+        )
 
     # {package_name: {project_name: specifier_string}}
     packages: dict[str, dict[str, str]] = {}
-
-    for subdir in subdirs:
-        pyproject = subdir / "pyproject.toml"
-        if not pyproject.exists():
-            continue
-
-        with open(pyproject, "rb") as f:
-            try:
-                data = tomllib.load(f)
-            except Exception:
+    if not subdirs:
+        return packages
+
+    cache_dir = get_cache_dir(workspace_root, "depcache")
+
+    def scan_one(subdir: str) -> dict[str, str] | None:
+        return _scan_pyproject(workspace_root / subdir / "pyproject.toml", cache_dir)
+
+    # Reads and parses are independent per project (each has its own cache
+    # file), so run them concurrently and fold the results in sorted order
+    # as they arrive.
+    workers = min(SCAN_MAX_WORKERS, (os.cpu_count() or 1) * 4, len(subdirs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for subdir, all_deps in zip(subdirs, pool.map(scan_one, subdirs)):
+            # Missing or unreadable pyproject.toml files come back as None
+            if all_deps is None:
                 continue
 
-        all_deps: dict[str, str] = {}
+            for pkg_name, spec_str in all_deps.items():
+                packages.setdefault(pkg_name, {})[subdir] = spec_str
+                if on_lower_bound is not None and _extract_min_version(spec_str) is not None:
+                    on_lower_bound(pkg_name)
 
-        # Main dependencies
-        main = data.get("project", {}).get("dependencies", [])
-        all_deps.update(_parse_deps(main))
+    return packages
 
-        # Optional dependencies
-        for group_deps in data.get("project", {}).get("optional-dependencies", {}).values():
-            all_deps.update(_parse_deps(group_deps))
 
-        # Dependency groups (PEP 735 / uv)
-        for group_deps in data.get("dependency-groups", {}).values():
-            if isinstance(group_deps, list):
-                # Filter to plain strings (skip include-group dicts)
-                all_deps.update(_parse_deps(
-                    [d for d in group_deps if isinstance(d, str)]
-                ))
+def find_mismatches(packages: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+    """Return only packages where specifiers differ across projects."""
+    result: dict[str, dict[str, str]] = {}
+    for pkg, projects in packages.items():
+        if len(projects) < 2:
+            continue
+        specs = iter(projects.values())
+        first = next(specs)
+        if any(spec != first for spec in specs):
+            result[pkg] = projects
+    return result
 
-        for pkg_name, spec_str in all_deps.items():
-            packages.setdefault(pkg_name, {})[subdir.name] = spec_str
 
-    return packages
+@lru_cache(maxsize=4096)
+def _parsed_spec(spec_str: str) -> SpecifierSet:
+    return SpecifierSet(spec_str)
 
 
-def find_mismatches(packages: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
-    """Return only packages where specifiers differ across projects."""
-    return {
-        pkg: projects
-        for pkg, projects in packages.items()
-        if len(projects) > 1 and len(set(projects.values())) > 1
-    }
+@lru_cache(maxsize=4096)
+def _parsed_version(version_str: str) -> Version:
+    return Version(version_str)
 
 
+@lru_cache(maxsize=4096)
 def _extract_min_version(spec_str: str) -> Version | None:
     """Extract the minimum version from a >= specifier."""
-    spec = SpecifierSet(spec_str)
+    spec = _parsed_spec(spec_str)
     best: Version | None = None
     for s in spec:
         if s.operator == ">=":
-            v = Version(s.version)
+            v = _parsed_version(s.version)
             if best is None or v > best:
                 best = v
     return best
 
 
+@lru_cache(maxsize=4096)
 def _is_simple_gte(spec_str: str) -> bool:
     """Check if a specifier is a simple >=X.Y.Z (possibly empty)."""
     if not spec_str:
         return True
-    spec = SpecifierSet(spec_str)
+    # Specifier strings come from _parse_deps already normalized, so a single
+    # clause can be judged by its operator without building a SpecifierSet
+    if "," not in spec_str:
+        return spec_str.startswith(">=")
+    spec = _parsed_spec(spec_str)
     return all(s.operator == ">=" for s in spec)
 
 
@@ -115,11 +250,12 @@ def highest_minimum(specifiers: dict[str, str]) -> str | None:
 
     Returns None if any specifier is not a simple >= (has ==, <, ~= etc).
     """
-    if not all(_is_simple_gte(s) for s in specifiers.values()):
-        return None
-
+    # One pass, bailing out on the first non-simple specifier. Both helpers
+    # are memoized, so repeated specifiers across projects are free.
     best: Version | None = None
     for spec_str in specifiers.values():
+        if not _is_simple_gte(spec_str):
+            return None
         v = _extract_min_version(spec_str)
         if v is not None and (best is None or v > best):
             best = v
@@ -127,25 +263,171 @@ def highest_minimum(specifiers: dict[str, str]) -> str | None:
     return f">={best}" if best else None
 
 
-def _update_dep_line(content: str, package_name: str, new_spec: str) -> str:
-    """Replace a dependency's version specifier in pyproject.toml text."""
-    # Match the package name (case-insensitive) followed by any specifier
-    # in a dependencies list context
-    pattern = re.compile(
-        rf'(?i)((?:^|\s|["\'])({re.escape(package_name)}))\s*([><=!~][^\s"\'#,\]]*)?',
+@lru_cache(maxsize=1024)
+def _dep_names_pattern(names: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile the dependency matcher for a set of normalized names.
+
+    Cached because the same names are rewritten in file after file (and,
+    via _rewrite_dependencies, one name per dependency string).
+    """
+    alternation = "|".join(
+        "[-_.]+".join(re.escape(part) for part in n.split("-"))
+        for n in sorted(names, key=len, reverse=True)
     )
+    # Match the package name followed by optional extras and any specifier,
+    # but not as a prefix of a longer name (e.g. "click" in "clickhouse")
+    return re.compile(
+        rf'(?i)((?:^|\s|["\'])({alternation}))(?![A-Za-z0-9._-])'
+        rf'(\s*\[[^\]]*\])?\s*([><=!~][^\s"\'#,;\]]*)?',
+    )
+
+
+def _update_dep_lines(content: str, updates: dict[str, str]) -> str:
+    """Replace the version specifiers of several dependencies in one pass.
+
+    updates maps package names (matched by their PEP 503 normalized form, so
+    case and -/_/. separators don't matter) to the new specifier. All names
+    are fused into a single alternation so the text is scanned once
+    regardless of how many packages change.
+    """
+    if not updates:
+        return content
+
+    specs = {_canon(name): spec for name, spec in updates.items()}
+    pattern = _dep_names_pattern(tuple(sorted(specs)))
 
     def replacer(m: re.Match) -> str:
-        return f"{m.group(1)}{new_spec}"
+        return f"{m.group(1)}{m.group(3) or ''}{specs[_canon(m.group(2))]}"
 
     return pattern.sub(replacer, content)
 
 
+def _update_dep_line(content: str, package_name: str, new_spec: str) -> str:
+    """Replace a dependency's version specifier in pyproject.toml text."""
+    return _update_dep_lines(content, {package_name: new_spec})
+
+
+def _rewrite_dependencies(content: str, updates: dict[str, str]) -> str:
+    """Rewrite dependency specifiers in pyproject.toml text.
+
+    The file is parsed to find the actual dependency strings, and only those
+    string literals are edited in place, so formatting is preserved and package
+    names mentioned in comments, URLs, or other tables are left alone.
+    """
+    try:
+        data = tomllib.loads(content)
+    except tomllib.TOMLDecodeError:
+        return content
+
+    specs = {_canon(name): spec for name, spec in updates.items()}
+    # {quoted old literal: quoted new literal}, applied in one pass at the end
+    literals: dict[str, str] = {}
+
+    for dep_str in _dependency_strings(data):
+        m = _SIMPLE_DEP.match(dep_str)
+        if m:
+            # Bare name or single clause: splice the new specifier in after
+            # the name directly, no regex substitution needed
+            name = _canon(m.group(1))
+            if name not in specs:
+                continue
+            new_dep = f"{dep_str[:m.end(1)]}{specs[name]}"
+        else:
+            parsed = _parse_deps([dep_str])
+            if not parsed:
+                continue
+            (name,) = parsed
+            if name not in specs:
+                continue
+            new_dep = _update_dep_lines(dep_str, {name: specs[name]})
+
+        if new_dep == dep_str:
+            continue
+        for quote in ('"', "'"):
+            literals[f"{quote}{dep_str}{quote}"] = f"{quote}{new_dep}{quote}"
+
+    if not literals:
+        return content
+    # Each key is a complete quoted literal, so no key can match inside
+    # another and a single alternation rewrites them all in one scan. Only
+    # the dependency arrays are scanned: the same literal elsewhere, e.g. in
+    # [tool.uv] constraint-dependencies, is left alone.
+    pattern = re.compile("|".join(re.escape(old) for old in literals))
+    parts: list[str] = []
+    end = 0
+    for start, stop in _dependency_spans(content):
+        parts.append(content[end:start])
+        parts.append(pattern.sub(lambda m: literals[m.group(0)], content[start:stop]))
+        end = stop
+    parts.append(content[end:])
+    return "".join(parts)
+
+
+def _dependency_spans(content: str) -> list[tuple[int, int]]:
+    """Return the (start, end) text spans holding dependency arrays, in order.
+
+    These are the values of dependencies and optional-dependencies under
+    [project], and the whole of [project.optional-dependencies] and
+    [dependency-groups].
+    """
+    headers = list(_TOML_TABLE_HEADER.finditer(content))
+    spans: list[tuple[int, int]] = []
+    for i, header in enumerate(headers):
+        name = ".".join(part.strip() for part in header.group(1).split("."))
+        start = header.end()
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+        if name in _DEP_TABLES:
+            spans.append((start, end))
+        elif name == "project":
+            for key in _TOML_DEP_KEY.finditer(content, start, end):
+                spans.append((key.end(), _toml_value_end(content, key.end())))
+    return spans
+
+
+def _toml_value_end(content: str, pos: int) -> int:
+    """Return where the array or inline table starting at pos ends."""
+    if content[pos:pos + 1] not in ("[", "{"):
+        return pos
+    depth = 0
+    for token in _TOML_TOKEN.finditer(content, pos):
+        char = token.group(0)
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        else:
+            continue
+        if depth <= 0:
+            return token.end()
+    return len(content)
+
+
+def _apply_edits(workspace_root: Path, edits: dict[str, dict[str, str]]) -> None:
+    """Apply {project: {package: specifier}} edits, touching each file once."""
+    for proj_name, updates in sorted(edits.items()):
+        pyproject = workspace_root / proj_name / "pyproject.toml"
+        # Read directly rather than stat()ing first: this is the only read of
+        # the file on the write path (scan_dependencies is usually served
+        # from the depcache and never opens it).
+        try:
+            content = pyproject.read_text()
+        except FileNotFoundError:
+            continue
+        new_content = _rewrite_dependencies(content, updates)
+
+        if new_content != content:
+            pyproject.write_text(new_content)
+            click.echo(f"  updated {proj_name}/pyproject.toml")
+
+
 def align_dependencies(
     workspace_root: Path,
     mismatches: dict[str, dict[str, str]],
 ) -> None:
     """Update pyproject.toml files to align dependency versions."""
+    # {project_name: {package_name: new_specifier}}
+    edits: dict[str, dict[str, str]] = defaultdict(dict)
+
     for pkg, projects in sorted(mismatches.items()):
         target = highest_minimum(projects)
         if target is None:
@@ -158,16 +440,10 @@ def align_dependencies(
         click.echo(f"  {click.style(pkg, bold=True)}: aligning to {target}")
 
         for proj_name, spec_str in projects.items():
-            if spec_str == target:
-                continue
+            if spec_str != target:
+                edits[proj_name][pkg] = target
 
-            pyproject = workspace_root / proj_name / "pyproject.toml"
-            content = pyproject.read_text()
-            new_content = _update_dep_line(content, pkg, target)
-
-            if new_content != content:
-                pyproject.write_text(new_content)
-                click.echo(f"    updated {proj_name}/pyproject.toml")
+    _apply_edits(workspace_root, edits)
 
 
 def show_report(mismatches: dict[str, dict[str, str]]) -> None:
@@ -193,6 +469,17 @@ def show_report(mismatches: dict[str, dict[str, str]]) -> None:
 # ---------------------------------------------------------------------------
 
 PYPI_URL = "https://pypi.org/pypi/{}/json"
+# PEP 691 JSON form of the simple index: a few KB instead of the full
+# release history the /json endpoint returns.
+PYPI_SIMPLE_URL = "https://pypi.org/simple/{}/"
+PYPI_SIMPLE_ACCEPT = "application/vnd.pypi.simple.v1+json"
+
+# Resolved versions are cached per package. Within the TTL no request is made
+# at all; after it, the stored ETag / Last-Modified let PyPI answer with a
+# bodiless 304.
+PYPI_CACHE_DIR = get_user_cache_dir() / "pypi"
+PYPI_CACHE_TTL = 3600  # seconds
+PYPI_MAX_WORKERS = 16
 
 
 @dataclass
@@ -202,24 +489,216 @@ class OutdatedInfo:
     simple: bool  # True if all specifiers are simple >=
 
 
+# Keep-alive connections, one per host per thread: http.client connections
+# aren't thread-safe, and find_outdated fetches from a thread pool. Reusing
+# them saves a TCP + TLS handshake on every lookup after a thread's first.
+_http_local = threading.local()
+
+
+def _connection(host: str) -> tuple[http.client.HTTPSConnection, bool]:
+    """Return this thread's connection to host, and whether it already existed."""
+    conns = getattr(_http_local, "conns", None)
+    if conns is None:
+        conns = _http_local.conns = {}
+    conn = conns.get(host)
+    if conn is not None:
+        return conn, True
+    conn = conns[host] = http.client.HTTPSConnection(host, timeout=10)
+    return conn, False
+
+
+def _drop_connection(host: str) -> None:
+    conn = _http_local.conns.pop(host, None)
+    if conn is not None:
+        conn.close()
+
+
+def _fetch(url: str, headers: dict[str, str]) -> tuple[bytes, str | None, str | None]:
+    """GET a URL, returning the body with the ETag and Last-Modified headers.
+
+    Non-200 responses raise urllib.error.HTTPError, as urlopen would.
+    """
+    parts = urllib.parse.urlsplit(url)
+    target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    while True:
+        conn, reused = _connection(parts.netloc)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            _drop_connection(parts.netloc)
+            if reused:
+                continue  # the server may have closed an idle connection
+            raise
+        break
+
+    if resp.status != 200:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return body, resp.getheader("ETag"), resp.getheader("Last-Modified")
+
+
+def _fetch_json(
+    url: str, headers: dict[str, str],
+) -> tuple[dict, str | None, str | None]:
+    """GET a JSON document, returning it with the ETag and Last-Modified headers."""
+    body, etag, last_modified = _fetch(url, headers)
+    return json.loads(body), etag, last_modified
+
+
+# PyPI's /json documents lead with the small "info" object, followed by the
+# full release history (often megabytes). Decoding just the leading object
+# avoids materializing all of that.
+_JSON_INFO_PREFIX = re.compile(r'\{\s*"info"\s*:\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_info_version(body: bytes) -> str:
+    """Return info.version from a PyPI /json body, decoding as little as possible."""
+    text = body.decode("utf-8")
+    m = _JSON_INFO_PREFIX.match(text)
+    if m:
+        try:
+            info, _ = _JSON_DECODER.raw_decode(text, m.end())
+            return info["version"]
+        except (ValueError, KeyError, TypeError):
+            pass
+    return json.loads(text)["info"]["version"]
+
+
+def _file_version(filename: str) -> Version | None:
+    """Return the version encoded in a distribution filename, if recognizable."""
+    try:
+        if filename.endswith(".whl"):
+            return parse_wheel_filename(filename)[1]
+        if filename.endswith((".tar.gz", ".zip")):
+            return parse_sdist_filename(filename)[1]
+    except Exception:
+        pass
+    return None
+
+
+def _latest_from_simple(data: dict) -> Version | None:
+    """Pick the highest stable, non-yanked version from a simple index response."""
+    # A version counts as yanked only if every file we can attribute to it is
+    # yanked; versions with no attributable files are treated as live
+    seen: set[Version] = set()
+    live: set[Version] = set()
+    for f in data.get("files", []):
+        v = _file_version(f.get("filename", ""))
+        if v is not None:
+            seen.add(v)
+            if not f.get("yanked"):
+                live.add(v)
+
+    best: Version | None = None
+    for v_str in data.get("versions", []):
+        try:
+            v = Version(v_str)
+        except InvalidVersion:
+            continue
+        if v.is_prerelease or (v in seen and v not in live):
+            continue
+        if best is None or v > best:
+            best = v
+    return best
+
+
+def _read_pypi_cache(cache_file: Path) -> dict | None:
+    """Load a cache entry, with "version" already parsed into a Version."""
+    try:
+        cached = json.loads(cache_file.read_text())
+        cached["version"] = Version(cached["version"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return cached
+
+
+def _write_pypi_cache(
+    cache_file: Path, version: Version, etag: str | None, last_modified: str | None,
+) -> None:
+    entry = {"version": str(version), "etag": etag, "last_modified": last_modified}
+    # The cache is shared by concurrent runs: write a private temp file and
+    # rename it into place so readers never see a partial entry.
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, cache_file)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
 def get_latest_version(package_name: str) -> Version | None:
-    """Fetch the latest stable version of a package from PyPI."""
-    url = PYPI_URL.format(package_name)
+    """Fetch the latest stable version of a package from PyPI.
+
+    Results (including failures) are memoized for the life of the process;
+    across runs the on-disk cache under PYPI_CACHE_DIR applies.
+    """
+    cache_file = PYPI_CACHE_DIR / f"{package_name}.json"
+    cached = _read_pypi_cache(cache_file)
+    if cached is not None:
+        try:
+            fresh = time.time() - cache_file.stat().st_mtime < PYPI_CACHE_TTL
+        except OSError:
+            fresh = False
+        if fresh:
+            return cached["version"]
+
+    headers = {"Accept": PYPI_SIMPLE_ACCEPT}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
     try:
-        req = urllib.request.Request(url, headers={"Accept": "application/json"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-        return Version(data["info"]["version"])
+        try:
+            data, etag, last_modified = _fetch_json(
+                PYPI_SIMPLE_URL.format(package_name), headers,
+            )
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                # Restart the TTL; the cached version is good either way
+                try:
+                    os.utime(cache_file)
+                except OSError:
+                    pass
+                return cached["version"]
+            raise
+
+        latest = _latest_from_simple(data)
+        if latest is None:
+            body, _, _ = _fetch(
+                PYPI_URL.format(package_name), {"Accept": "application/json"},
+            )
+            latest = Version(_json_info_version(body))
+            # The validators belong to the simple index response
+            etag = last_modified = None
     except Exception:
         return None
 
+    _write_pypi_cache(cache_file, latest, etag, last_modified)
+    return latest
+
 
 def find_outdated(
     packages: dict[str, dict[str, str]],
+    prefetched: dict[str, Future[Version | None]] | None = None,
 ) -> dict[str, OutdatedInfo]:
-    """Compare workspace specifiers against PyPI and return outdated packages."""
+    """Compare workspace specifiers against PyPI and return outdated packages.
+
+    prefetched maps package names to lookups already in flight (see
+    scan_and_find_outdated); other packages are fetched here.
+    """
     outdated: dict[str, OutdatedInfo] = {}
 
+    # (package, highest lower bound, all specifiers simple)
+    candidates: list[tuple[str, Version, bool]] = []
     for pkg in sorted(packages):
         specs = packages[pkg]
 
@@ -231,26 +710,62 @@ def find_outdated(
             if v is not None and (best_min is None or v > best_min):
                 best_min = v
 
-        if best_min is None:
-            continue
-
-        click.echo(f"  checking {pkg}...", nl=False)
-        latest = get_latest_version(pkg)
-        if latest is None:
-            click.echo(f" {click.style('failed', fg='red')}")
-            continue
-        click.echo(f" {latest}")
+        if best_min is not None:
+            candidates.append((pkg, best_min, all_simple))
+
+    if not candidates:
+        return outdated
+
+    # Lookups are network-bound, so fetch concurrently; results are consumed
+    # in candidate order so the progress output stays sorted.
+    prefetched = prefetched or {}
+    workers = min(PYPI_MAX_WORKERS, len(candidates))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        lookups = [
+            prefetched.get(pkg) or pool.submit(get_latest_version, pkg)
+            for pkg, _, _ in candidates
+        ]
+
+        for (pkg, best_min, all_simple), lookup in zip(candidates, lookups):
+            latest = lookup.result()
+            click.echo(f"  checking {pkg}...", nl=False)
+            if latest is None:
+                click.echo(f" {click.style('failed', fg='red')}")
+                continue
+            click.echo(f" {latest}")
 
-        if latest > best_min:
-            outdated[pkg] = OutdatedInfo(
-                current_min=best_min,
-                latest=latest,
-                simple=all_simple,
-            )
+            if latest > best_min:
+                outdated[pkg] = OutdatedInfo(
+                    current_min=best_min,
+                    latest=latest,
+                    simple=all_simple,
+                )
 
     return outdated
 
 
+def scan_and_find_outdated(
+    workspace_root: Path,
+    project_names: tuple[str, ...] | None = None,
+) -> tuple[dict[str, dict[str, str]], dict[str, OutdatedInfo]]:
+    """Scan the workspace and check PyPI, overlapping the two.
+
+    Each package's lookup starts as soon as the scan finds a >= bound for it,
+    so parsing and network round trips run side by side. Returns the
+    scan_dependencies result along with the find_outdated result.
+    """
+    lookups: dict[str, Future[Version | None]] = {}
+    with ThreadPoolExecutor(max_workers=PYPI_MAX_WORKERS) as pool:
+        def prefetch(pkg: str) -> None:
+            if pkg not in lookups:
+                lookups[pkg] = pool.submit(get_latest_version, pkg)
+
+        packages = scan_dependencies(workspace_root, project_names, on_lower_bound=prefetch)
+        click.echo("Checking PyPI for updates:\n")
+        outdated = find_outdated(packages, lookups)
+    return packages, outdated
+
+
 def show_outdated_report(outdated: dict[str, OutdatedInfo]) -> None:
     """Print a report of packages with newer PyPI versions."""
     if not outdated:
@@ -279,6 +794,9 @@ def upgrade_dependencies(
     outdated: dict[str, OutdatedInfo],
 ) -> None:
     """Update pyproject.toml files to bump >= specifiers to PyPI latest."""
+    # {project_name: {package_name: new_specifier}}
+    edits: dict[str, dict[str, str]] = defaultdict(dict)
+
     for pkg in sorted(outdated):
         info = outdated[pkg]
         if not info.simple:
@@ -299,12 +817,6 @@ def upgrade_dependencies(
             if cur is not None and cur >= info.latest:
                 continue
 
-            pyproject = workspace_root / proj_name / "pyproject.toml"
-            if not pyproject.exists():
-                continue
-            content = pyproject.read_text()
-            new_content = _update_dep_line(content, pkg, new_spec)
+            edits[proj_name][pkg] = new_spec
 
-            if new_content != content:
-                pyproject.write_text(new_content)
-                click.echo(f"    updated {proj_name}/pyproject.toml")
+    _apply_edits(workspace_root, edits)
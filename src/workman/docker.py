@@ -1,39 +1,137 @@
 from __future__ import annotations
 
-import re
+import io
+import json
+import os
+import shutil
 import subprocess
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from typing import TypeVar
 
 import click
 
 from workman.config import (
-    ImageConfig,
+    BuildPlan,
     ProjectConfig,
     WorkspaceConfig,
     get_build_context,
-    get_docker_projects,
-    get_effective_latest_tag,
+    resolve_build_plan,
 )
 
-DATE_TAG_PATTERN = re.compile(r"^(\d{8})-(\d+)$")
+# Projects are processed concurrently; images within a project stay sequential
+# so builds of the same project don't thrash each other's layer cache.
+DEFAULT_MAX_PARALLEL = 8
+
+# Pushes go through skopeo when available, which uploads an image's blobs in
+# parallel (WORKMAN_SKOPEO_PARALLEL, default 16) instead of docker's limit of 5.
+_SKOPEO = shutil.which("skopeo")
+DEFAULT_SKOPEO_PARALLEL = 16
+
+T = TypeVar("T")
+
+
+def _max_parallel() -> int:
+    """Return the project concurrency limit (WORKMAN_MAX_PARALLEL, default 8)."""
+    try:
+        return max(1, int(os.environ.get("WORKMAN_MAX_PARALLEL", DEFAULT_MAX_PARALLEL)))
+    except ValueError:
+        return DEFAULT_MAX_PARALLEL
+
+
+def _echo(message: str, out: io.StringIO | None) -> None:
+    """Echo to stdout, or into a per-project buffer when running in parallel."""
+    click.echo(message, file=out, color=True if out is not None else None)
+
+
+def _run(cmd: list[str], out: io.StringIO | None) -> int:
+    """Run a command, capturing its output into out when buffering."""
+    if out is None:
+        return subprocess.run(cmd).returncode
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    out.write(result.stdout)
+    return result.returncode
+
+
+def _for_each_project(
+    projects: list[ProjectConfig],
+    worker: Callable[[ProjectConfig, io.StringIO | None], T],
+) -> list[T]:
+    """Run worker for every project, possibly in parallel.
+
+    Output from parallel workers is buffered per project and flushed in
+    project order. A failure doesn't stop the other projects: once every
+    project has finished and its output has been shown, the first failure
+    (in project order) is re-raised.
+    """
+    workers = min(_max_parallel(), len(projects))
+    if workers <= 1:
+        return [worker(proj, None) for proj in projects]
+
+    results: list[T] = []
+    first_exc: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        buffers = [io.StringIO() for _ in projects]
+        futures = [pool.submit(worker, proj, out) for proj, out in zip(projects, buffers)]
+        for future, out in zip(futures, buffers):
+            exc = future.exception()
+            click.echo(out.getvalue(), nl=False)
+            if exc is None:
+                results.append(future.result())
+            elif first_exc is None:
+                first_exc = exc
+    if first_exc is not None:
+        raise first_exc
+    return results
+
+
+def _skopeo_parallel() -> int:
+    try:
+        return max(1, int(os.environ.get("WORKMAN_SKOPEO_PARALLEL", DEFAULT_SKOPEO_PARALLEL)))
+    except ValueError:
+        return DEFAULT_SKOPEO_PARALLEL
+
+
+def _push_cmd(ref: str) -> list[str]:
+    """Return the command that pushes a local image ref to its registry."""
+    if _SKOPEO is None:
+        return ["docker", "push", ref]
+    return [
+        _SKOPEO, "copy",
+        "--format=v2s2",
+        f"--image-parallel-copies={_skopeo_parallel()}",
+        f"docker-daemon:{ref}",
+        f"docker://{ref}",
+    ]
 
 
 def _has_registry(image_name: str) -> bool:
     """Check if an image name includes a registry (has a dot before the first slash)."""
-    if "/" not in image_name:
+    slash = image_name.find("/")
+    if slash == -1:
         return False
-    prefix = image_name.split("/")[0]
-    return "." in prefix or ":" in prefix
+    return image_name.find(".", 0, slash) != -1 or image_name.find(":", 0, slash) != -1
 
 
-def _get_local_tags(image_name: str) -> list[str]:
-    """List local tags for a given image name."""
-    result = subprocess.run(
-        ["docker", "image", "ls", "--format", "{{.Tag}}", image_name],
-        capture_output=True,
+def _get_all_local_tags() -> dict[str, list[str]]:
+    """List tags of every local image in one docker call, keyed by repository."""
+    tags: dict[str, list[str]] = defaultdict(list)
+    with subprocess.Popen(
+        ["docker", "image", "ls", "--format", "{{.Repository}} {{.Tag}}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
-    )
-    return [t.strip() for t in result.stdout.strip().splitlines() if t.strip()]
+    ) as proc:
+        for line in proc.stdout:
+            repo, _, tag = line.strip().partition(" ")
+            # "<none>" marks untagged/dangling images, which nothing here uses
+            if repo and tag and tag != "<none>":
+                tags[repo].append(tag)
+    if proc.returncode != 0:
+        return defaultdict(list)
+    return tags
 
 
 def _get_registry_tags(image_name: str) -> list[str]:
@@ -46,7 +144,6 @@ def _get_registry_tags(image_name: str) -> list[str]:
             timeout=15,
         )
         if result.returncode == 0:
-            import json
             data = json.loads(result.stdout)
             return data.get("Tags", [])
     except (FileNotFoundError, subprocess.TimeoutExpired):
@@ -54,41 +151,100 @@ def _get_registry_tags(image_name: str) -> list[str]:
     return []
 
 
-def _max_n_for_today(tags: list[str], today: str) -> int:
-    """Find the maximum N for today's date pattern in a list of tags."""
-    max_n = 0
-    for tag in tags:
-        m = DATE_TAG_PATTERN.match(tag)
-        if m and m.group(1) == today:
-            max_n = max(max_n, int(m.group(2)))
-    return max_n
+def _parse_date_tag(tag: str) -> tuple[str, int] | None:
+    """Split a YYYYMMDD-N tag into (YYYYMMDD, N), or return None for other tags."""
+    day, sep, n = tag.partition("-")
+    if (
+        sep
+        and len(day) == 8
+        and day.isascii() and day.isdigit()
+        and n.isascii() and n.isdigit()
+    ):
+        return day, int(n)
+    return None
 
 
-def _next_tag(image_name: str) -> str:
-    """Determine the next YYYYMMDD-N tag for an image."""
-    today = date.today().strftime("%Y%m%d")
+def _parse_date_tags(tags: list[str]) -> list[tuple[str, str, int]]:
+    """Return (tag, YYYYMMDD, N) for every date-formatted tag."""
+    return [(t, *parsed) for t in tags if (parsed := _parse_date_tag(t))]
 
-    tags = _get_local_tags(image_name)
-    if _has_registry(image_name):
-        tags.extend(_get_registry_tags(image_name))
 
+def _max_n_for_today(tags: list[str], today: str) -> int:
+    """Find the maximum N for today's date pattern in a list of tags."""
+    return max(
+        (p[1] for t in tags if (p := _parse_date_tag(t)) and p[0] == today),
+        default=0,
+    )
+
+
+def _get_known_tags(
+    projects: list[ProjectConfig],
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Return (known, local) tags by image name.
+
+    known holds local tags plus registry tags for registry images; local
+    holds the local tags alone. The local listing and the (slow, networked)
+    skopeo lookups are independent, so they all run concurrently.
+    """
+    registry_images = sorted({
+        img.name for proj in projects for img in proj.images if _has_registry(img.name)
+    })
+    workers = min(_max_parallel(), len(registry_images)) + 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        local_future = pool.submit(_get_all_local_tags)
+        remote = list(pool.map(_get_registry_tags, registry_images))
+        local = local_future.result()
+    tags = defaultdict(list, {name: list(local_tags) for name, local_tags in local.items()})
+    for name, registry_tags in zip(registry_images, remote):
+        tags[name].extend(registry_tags)
+    return tags, local
+
+
+def _next_tag(tags: list[str], today: str) -> str:
+    """Determine the next YYYYMMDD-N tag given an image's known tags."""
     n = _max_n_for_today(tags, today) + 1
     return f"{today}-{n}"
 
 
-def build_images(ws: WorkspaceConfig, names: tuple[str, ...]) -> None:
-    """Build docker images for selected (or all) projects."""
-    projects = get_docker_projects(ws, names or None)
+def _buildkit_enabled() -> bool:
+    return os.environ.get("DOCKER_BUILDKIT") == "1"
 
-    if not projects:
-        click.echo("No docker-enabled projects found.")
-        return
 
-    for proj in projects:
-        latest = get_effective_latest_tag(ws, proj)
+def _pull_cache_image(ref: str) -> None:
+    """Best-effort pull of a cache source so the classic builder can use it."""
+    subprocess.run(["docker", "pull", ref], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _bake_target_name(image_name: str, taken: set[str]) -> str:
+    """Return a unique bake target name (letters, digits, '-' and '_') for an image."""
+    base = "".join(c if c.isalnum() or c in "-_" else "_" for c in image_name)
+    name, n = base, 1
+    while name in taken:
+        n += 1
+        name = f"{base}_{n}"
+    taken.add(name)
+    return name
+
+
+def _bake_images(
+    plan: BuildPlan,
+    known_tags: dict[str, list[str]],
+    today: str,
+    cache_from: bool,
+) -> None:
+    """Build every image with a single `docker buildx bake` invocation.
+
+    Tags are assigned up front and the bake file is passed as JSON on stdin,
+    so buildx can schedule all targets at once and share layers between them.
+    """
+    targets: dict[str, dict] = {}
+    built: list[tuple[str, str, str]] = []
+    for proj in plan.projects:
+        latest = plan.latest_tags[proj.name]
 
         for img in proj.images:
-            tag = _next_tag(img.name)
+            tag = _next_tag(known_tags.get(img.name, []), today)
+            known_tags.setdefault(img.name, []).extend((tag, latest))
             context = get_build_context(proj, img)
 
             click.echo(
@@ -96,50 +252,131 @@ def build_images(ws: WorkspaceConfig, names: tuple[str, ...]) -> None:
                 f"building {img.name}:{tag} in {context}"
             )
 
+            target = {
+                "context": str(context),
+                "tags": [f"{img.name}:{tag}", f"{img.name}:{latest}"],
+            }
+            if img.dockerfile:
+                target["dockerfile"] = img.dockerfile  # bake resolves it against the context
+            if cache_from:
+                target["cache-from"] = [f"{img.name}:{latest}"]
+                target["cache-to"] = ["type=inline"]
+            targets[_bake_target_name(img.name, set(targets))] = target
+            built.append((img.name, tag, latest))
+
+    definition = {"group": {"default": {"targets": list(targets)}}, "target": targets}
+    result = subprocess.run(
+        ["docker", "buildx", "bake", "--file", "-", "--load", "--progress=plain"],
+        input=json.dumps(definition),
+        text=True,
+    )
+    if result.returncode != 0:
+        raise click.ClickException("docker buildx bake failed")
+
+    for name, tag, latest in built:
+        click.echo(f"  tagged {name}:{tag} and {name}:{latest}")
+
+
+def build_images(
+    ws: WorkspaceConfig,
+    names: tuple[str, ...],
+    *,
+    bake: bool = False,
+    cache_from: bool = True,
+) -> None:
+    """Build docker images for selected (or all) projects.
+
+    With bake=True all images are built in one `docker buildx bake` run
+    instead of one `docker build` per image. Unless cache_from is False, each
+    build seeds its layer cache from the image's current latest tag, which
+    keeps builds on fresh machines (e.g. CI) from starting from scratch.
+    """
+    plan = resolve_build_plan(ws, names or None)
+
+    if not plan.projects:
+        click.echo("No docker-enabled projects found.")
+        return
+
+    known_tags, local_tags = _get_known_tags(plan.projects)
+    # Fixed once per run so every image shares a date even across midnight
+    today = date.today().strftime("%Y%m%d")
+
+    if bake:
+        _bake_images(plan, known_tags, today, cache_from)
+        return
+
+    buildkit = _buildkit_enabled()
+
+    def build_project(proj: ProjectConfig, out: io.StringIO | None) -> None:
+        latest = plan.latest_tags[proj.name]
+
+        for img in proj.images:
+            tag = _next_tag(known_tags.get(img.name, []), today)
+            context = get_build_context(proj, img)
+
+            _echo(
+                f"{click.style(proj.name, bold=True)}: "
+                f"building {img.name}:{tag} in {context}",
+                out,
+            )
+
             cmd = [
                 "docker", "build",
                 "-t", f"{img.name}:{tag}",
                 "-t", f"{img.name}:{latest}",
             ]
+            if cache_from:
+                cache_ref = f"{img.name}:{latest}"
+                # BuildKit reads the cache source from the registry itself;
+                # the classic builder needs it local, so fetch it only if
+                # it isn't there yet (a pull would also move the local tag)
+                if (
+                    not buildkit
+                    and _has_registry(img.name)
+                    and latest not in local_tags.get(img.name, ())
+                ):
+                    _pull_cache_image(cache_ref)
+                cmd.extend(["--cache-from", cache_ref])
+                if buildkit:
+                    # Embed cache metadata so the pushed image can seed later builds
+                    cmd.extend(["--cache-to", "type=inline"])
             if img.dockerfile:
                 cmd.extend(["-f", str(context / img.dockerfile)])
             cmd.append(str(context))
 
-            result = subprocess.run(cmd)
-            if result.returncode != 0:
+            if _run(cmd, out) != 0:
                 raise click.ClickException(
                     f"Docker build failed for {proj.name} ({img.name})"
                 )
 
-            click.echo(
-                f"  tagged {img.name}:{tag} and {img.name}:{latest}"
-            )
+            known_tags.setdefault(img.name, []).extend((tag, latest))
+            _echo(f"  tagged {img.name}:{tag} and {img.name}:{latest}", out)
+
+    _for_each_project(plan.projects, build_project)
 
 
 def push_images(ws: WorkspaceConfig, names: tuple[str, ...]) -> None:
     """Push images that have a registry in the name."""
-    projects = get_docker_projects(ws, names or None)
+    plan = resolve_build_plan(ws, names or None)
+    local_tags = _get_all_local_tags() if plan.projects else {}
 
-    found_any = False
-    for proj in projects:
-        latest = get_effective_latest_tag(ws, proj)
+    def push_project(proj: ProjectConfig, out: io.StringIO | None) -> bool:
+        latest = plan.latest_tags[proj.name]
 
+        found_any = False
         for img in proj.images:
             if not _has_registry(img.name):
                 continue
             found_any = True
-            tags = _get_local_tags(img.name)
+            tags = local_tags.get(img.name, [])
 
-            date_tags = []
-            for t in tags:
-                m = DATE_TAG_PATTERN.match(t)
-                if m:
-                    date_tags.append((t, m.group(1), int(m.group(2))))
+            date_tags = _parse_date_tags(tags)
 
             if not date_tags:
-                click.echo(
+                _echo(
                     f"{click.style(proj.name, bold=True)} ({img.name}): "
-                    f"no date-tagged images to push"
+                    f"no date-tagged images to push",
+                    out,
                 )
                 continue
 
@@ -148,34 +385,32 @@ def push_images(ws: WorkspaceConfig, names: tuple[str, ...]) -> None:
 
             for push_tag in (most_recent, latest):
                 ref = f"{img.name}:{push_tag}"
-                click.echo(f"{click.style(proj.name, bold=True)}: pushing {ref}")
-                result = subprocess.run(["docker", "push", ref])
-                if result.returncode != 0:
+                _echo(f"{click.style(proj.name, bold=True)}: pushing {ref}", out)
+                if _run(_push_cmd(ref), out) != 0:
                     raise click.ClickException(f"Push failed for {ref}")
+        return found_any
 
-    if not found_any:
+    if not any(_for_each_project(plan.projects, push_project)):
         click.echo("No projects with registry images found.")
 
 
 def prune_images(ws: WorkspaceConfig, names: tuple[str, ...] | None = None) -> None:
     """Remove all images except the most recent for each project."""
-    projects = get_docker_projects(ws, names)
+    plan = resolve_build_plan(ws, names)
 
-    if not projects:
+    if not plan.projects:
         click.echo("No docker-enabled projects found.")
         return
 
-    for proj in projects:
-        latest = get_effective_latest_tag(ws, proj)
+    local_tags = _get_all_local_tags()
+
+    def prune_project(proj: ProjectConfig, out: io.StringIO | None) -> None:
+        latest = plan.latest_tags[proj.name]
 
         for img in proj.images:
-            tags = _get_local_tags(img.name)
+            tags = local_tags.get(img.name, [])
 
-            date_tags = []
-            for t in tags:
-                m = DATE_TAG_PATTERN.match(t)
-                if m:
-                    date_tags.append((t, m.group(1), int(m.group(2))))
+            date_tags = _parse_date_tags(tags)
 
             date_tags.sort(key=lambda x: (x[1], x[2]), reverse=True)
 
@@ -186,15 +421,18 @@ def prune_images(ws: WorkspaceConfig, names: tuple[str, ...] | None = None) -> N
             to_remove = [t for t in tags if t not in keep and t != "<none>"]
 
             if not to_remove:
-                click.echo(
-                    f"{click.style(proj.name, bold=True)} ({img.name}): nothing to prune"
+                _echo(
+                    f"{click.style(proj.name, bold=True)} ({img.name}): nothing to prune",
+                    out,
                 )
                 continue
 
             for t in to_remove:
                 ref = f"{img.name}:{t}"
-                click.echo(f"{click.style(proj.name, bold=True)}: removing {ref}")
+                _echo(f"{click.style(proj.name, bold=True)}: removing {ref}", out)
                 subprocess.run(
                     ["docker", "rmi", ref],
                     capture_output=True,
                 )
+
+    _for_each_project(plan.projects, prune_project)
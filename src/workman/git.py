@@ -1,60 +1,70 @@
 from __future__ import annotations
 
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
 
-def is_git_repo(path: Path) -> bool:
-    return (path / ".git").exists()
+def is_git_repo(path: str | Path) -> bool:
+    # .git may be a file (worktrees, submodules), so don't require a directory
+    return os.path.exists(os.path.join(path, ".git"))
 
 
 def get_git_status(repo_path: Path) -> str:
     """Run git status --short and return the output."""
-    result = subprocess.run(
+    # rstrip only: the leading status column of each line is significant
+    with subprocess.Popen(
         ["git", "-C", str(repo_path), "status", "--short"],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
-    )
-    return result.stdout.strip()
+    ) as proc:
+        lines = [stripped for line in proc.stdout if (stripped := line.rstrip())]
+    return "\n".join(lines)
+
+
+def _echo_status(header: str, status: str) -> None:
+    if status:
+        click.echo(f"{header}:")
+        for line in status.splitlines():
+            click.echo(f"  {line}")
+    else:
+        click.echo(f"{header}: {click.style('clean', fg='green')}")
 
 
 def show_status(workspace_root: Path, project_names: tuple[str, ...] | None = None) -> None:
     """Print git status for the workspace repo (if any) and subproject repos."""
-
-    # Workspace-level repo (always shown)
-    if is_git_repo(workspace_root):
-        status = get_git_status(workspace_root)
-        header = click.style("workspace", bold=True, fg="cyan")
-        if status:
-            click.echo(f"{header}:")
-            for line in status.splitlines():
-                click.echo(f"  {line}")
-        else:
-            click.echo(f"{header}: {click.style('clean', fg='green')}")
+    workspace_is_repo = is_git_repo(workspace_root)
 
     # Subproject repos
-    subdirs = sorted(
-        p for p in workspace_root.iterdir()
-        if p.is_dir() and not p.name.startswith(".")
-    )
+    with os.scandir(workspace_root) as it:
+        repos = sorted(
+            Path(e.path) for e in it
+            if not e.name.startswith(".")
+            and (project_names is None or e.name in project_names)
+            and e.is_dir()
+            and is_git_repo(e.path)
+        )
 
-    if project_names is not None:
-        subdirs = [d for d in subdirs if d.name in project_names]
+    # Each git status is independent, so run them all concurrently and print
+    # the results afterwards in the usual order.
+    targets = ([workspace_root] if workspace_is_repo else []) + repos
+    if targets:
+        with ThreadPoolExecutor(max_workers=min(16, len(targets))) as pool:
+            statuses = list(pool.map(get_git_status, targets))
+    else:
+        statuses = []
 
-    repos = [d for d in subdirs if is_git_repo(d)]
+    # Workspace-level repo (always shown)
+    if workspace_is_repo:
+        _echo_status(click.style("workspace", bold=True, fg="cyan"), statuses.pop(0))
 
-    if not repos and not is_git_repo(workspace_root):
+    if not repos and not workspace_is_repo:
         click.echo("No git repositories found in workspace.")
         return
 
-    for repo in repos:
-        status = get_git_status(repo)
-        header = click.style(repo.name, bold=True)
-        if status:
-            click.echo(f"{header}:")
-            for line in status.splitlines():
-                click.echo(f"  {line}")
-        else:
-            click.echo(f"{header}: {click.style('clean', fg='green')}")
+    for repo, status in zip(repos, statuses):
+        _echo_status(click.style(repo.name, bold=True), status)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import click
@@ -7,6 +8,8 @@ import click
 MARKER_START = "# --- workman managed (do not edit) ---"
 MARKER_END = "# --- end workman managed ---"
 
+_MANAGED_RE = re.compile(re.escape(MARKER_START) + r".*?" + re.escape(MARKER_END), re.DOTALL)
+
 
 def update_gitignore(workspace_root: Path, project_names: list[str]) -> None:
     """Create or update .gitignore with a managed block listing project directories."""
@@ -19,24 +22,25 @@ def update_gitignore(workspace_root: Path, project_names: list[str]) -> None:
         existing = ""
 
     # Build the managed block
-    managed_lines = [MARKER_START]
-    for name in sorted(project_names):
-        managed_lines.append(f"{name}/")
-    managed_lines.append(MARKER_END)
-    managed_block = "\n".join(managed_lines)
+    entries = "".join(f"{name}/\n" for name in sorted(project_names))
+    managed_block = f"{MARKER_START}\n{entries}{MARKER_END}"
 
     # Replace existing managed block or append
-    if MARKER_START in existing and MARKER_END in existing:
-        before = existing[: existing.index(MARKER_START)]
-        after = existing[existing.index(MARKER_END) + len(MARKER_END) :]
-        new_content = before + managed_block + after
-    else:
+    # A callable replacement keeps project names out of re's escape handling
+    new_content, replaced = _MANAGED_RE.subn(lambda _: managed_block, existing, count=1)
+    if not replaced:
         # Append, ensuring a blank line separator
-        if existing and not existing.endswith("\n"):
-            existing += "\n"
-        if existing and not existing.endswith("\n\n"):
-            existing += "\n"
-        new_content = existing + managed_block + "\n"
+        prefix = existing
+        if prefix and not prefix.endswith("\n"):
+            prefix += "\n"
+        if prefix and not prefix.endswith("\n\n"):
+            prefix += "\n"
+        new_content = prefix + managed_block + "\n"
+
+    # Leave the file (and its mtime) alone on idempotent re-runs
+    if new_content == existing:
+        click.echo(".gitignore unchanged.")
+        return
 
     gitignore_path.write_text(new_content)
 
@@ -1,51 +1,69 @@
 from __future__ import annotations
 
+import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 import click
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
 from workman.config import CONFIG_FILENAME
 from workman.gitignore import update_gitignore
 
 
 def _get_subdirs(workspace_root: Path) -> list[Path]:
     """Return immediate non-hidden subdirectories."""
-    return sorted(
-        p for p in workspace_root.iterdir()
-        if p.is_dir() and not p.name.startswith(".")
-    )
+    with os.scandir(workspace_root) as it:
+        return sorted(
+            Path(e.path) for e in it
+            if not e.name.startswith(".") and e.is_dir()
+        )
+
 
+def _find_dockerfiles(path: Path) -> list[tuple[str, str]]:
+    """Return (filename, suffix) for Dockerfiles in a directory, sorted by filename.
 
-def _find_dockerfiles(path: Path) -> list[str]:
-    """Return Dockerfile names found in a directory (Dockerfile, Dockerfile.*)."""
-    results = []
-    for f in sorted(path.iterdir()):
-        if f.is_file() and (f.name == "Dockerfile" or f.name.startswith("Dockerfile.")):
-            results.append(f.name)
-    return results
+    The suffix is the part after "Dockerfile." ("" for a plain Dockerfile).
+    """
+    with os.scandir(path) as it:
+        found = [
+            (e.name, e.name[len("Dockerfile"):].lstrip("."))
+            for e in it
+            if (e.name == "Dockerfile" or e.name.startswith("Dockerfile.")) and e.is_file()
+        ]
+    found.sort()
+    return found
 
 
+@lru_cache(maxsize=1)
 def _get_local_images() -> dict[str, str]:
-    """Return a map of image-name-fragment -> full repository name for local Docker images."""
-    result = subprocess.run(
+    """Return a map of image-name-fragment -> full repository name for local Docker images.
+
+    Cached for the life of the process; callers must not mutate the result.
+    """
+    images: dict[str, str] = {}
+    with subprocess.Popen(
         ["docker", "image", "ls", "--format", "{{.Repository}}"],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
-    )
-    if result.returncode != 0:
+    ) as proc:
+        for line in proc.stdout:
+            repo = line.strip()
+            if not repo or repo == "<none>":
+                continue
+            basename = repo.rsplit("/", 1)[-1]
+            if basename not in images:
+                images[basename] = repo
+
+    if proc.returncode != 0:
         return {}
-
-    images: dict[str, str] = {}
-    for line in result.stdout.strip().splitlines():
-        repo = line.strip()
-        if not repo or repo == "<none>":
-            continue
-        basename = repo.rsplit("/", 1)[-1]
-        if basename not in images:
-            images[basename] = repo
-
     return images
 
 
@@ -82,13 +100,12 @@ def init_workspace(workspace_root: Path) -> None:
             # Single or no Dockerfile — one image entry
             image_name = matched_image or name
             entry: dict[str, str] = {"name": image_name}
-            if dockerfiles and dockerfiles[0] != "Dockerfile":
-                entry["dockerfile"] = dockerfiles[0]
+            if dockerfiles and dockerfiles[0][0] != "Dockerfile":
+                entry["dockerfile"] = dockerfiles[0][0]
             images.append(entry)
         else:
             # Multiple Dockerfiles — one image per Dockerfile
-            for df in dockerfiles:
-                suffix = df.removeprefix("Dockerfile").lstrip(".")
+            for df, suffix in dockerfiles:
                 image_name = f"{matched_image or name}-{suffix}" if suffix else (matched_image or name)
                 entry = {"name": image_name, "dockerfile": df}
                 images.append(entry)
@@ -103,7 +120,7 @@ def init_workspace(workspace_root: Path) -> None:
         config["projects"] = projects
 
     with open(config_path, "w") as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
 
     click.echo(f"\nWrote {CONFIG_FILENAME} with {len(projects)} project(s).")
 
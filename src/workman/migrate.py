@@ -2,21 +2,71 @@ from __future__ import annotations
 
 import ast
 import configparser
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import stat
+import string
+import sys
+import threading
 import tomllib
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 import click
 import tomli_w
 
+from workman.cache import get_user_cache_dir
+
 
 LEGACY_FILES = ["setup.py", "setup.cfg", "requirements.txt"]
 
 # Priority order: highest first
 PRIORITY = ["pyproject.toml", "setup.cfg", "setup.py", "requirements.txt"]
 
+# Parse results keyed by (resolved path, mtime_ns, size), so files that haven't
+# changed are parsed once per process. Cached values must not be mutated.
+# (Legacy file parsers are memoized the same way; see _stat_cached.)
+_TOML_CACHE: dict[tuple[str, int, int], dict] = {}
+
+_MISSING = object()
+
+# setup.py metadata is also cached across runs, keyed by a hash of the source.
+# Bump the version whenever extraction changes what a setup.py yields.
+SETUP_PY_CACHE_DIR = get_user_cache_dir() / "setup-py"
+SETUP_PY_CACHE_VERSION = 1
+SETUP_PY_CACHE_MAX_SIZE = 1 << 20  # larger sources aren't worth keeping
+
+# Workspaces with at least this many projects are migrated in worker
+# processes (parsing holds the GIL); below it, starting interpreters costs
+# more than it saves and threads are used instead.
+MIGRATE_PROCESS_THRESHOLD = 32
+
+# Generated pyproject.toml defaults. Copied per project (the build-system
+# requires list included), so callers are free to modify what they get back.
+_BUILD_SYSTEM = {"requires": ["hatchling"], "build-backend": "hatchling.build"}
+_DEFAULT_REQUIRES_PYTHON = ">=3.10"
+
+# Tables _fast_dumps writes itself; documents with any others go to tomli_w
+_FAST_TOML_TABLES = frozenset({"build-system", "project"})
+_BARE_KEY_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
 
-@dataclass
+# requirements.txt option lines
+_REQ_INCLUDE_PREFIXES = ("-r", "--requirement")
+_REQ_EDITABLE_PREFIXES = ("-e", "--editable")
+_REQ_SKIP_PREFIXES = (
+    "-i", "--index-url", "--extra-index-url", "--find-links",
+    "--no-binary", "--only-binary", "--trusted-host",
+    "-f", "--pre", "--no-deps",
+)
+
+
+@dataclass(slots=True)
 class ProjectMetadata:
     """Aggregated metadata extracted from legacy config files."""
 
@@ -31,7 +81,7 @@ class ProjectMetadata:
     warnings: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class MigrationResult:
     """Result of migrating a single project."""
 
@@ -47,19 +97,36 @@ class MigrationResult:
 # ---------------------------------------------------------------------------
 
 
+def _is_setup_call(node: ast.AST) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name) and func.id == "setup":
+        return True
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "setup"
+        and isinstance(func.value, ast.Name)
+    )
+
+
 def _find_setup_call(tree: ast.Module) -> ast.Call | None:
-    """Find the setup() or setuptools.setup() call in the AST."""
+    """Find the setup() or setuptools.setup() call in the AST.
+
+    setup() is almost always a top-level statement, possibly under
+    `if __name__ == "__main__":`, so those are checked first; the full walk
+    is only a fallback for calls tucked away in functions and the like.
+    """
+    for stmt in tree.body:
+        candidates = [stmt]
+        if isinstance(stmt, ast.If):
+            candidates = stmt.body + stmt.orelse
+        for node in candidates:
+            if isinstance(node, ast.Expr) and _is_setup_call(node.value):
+                return node.value
+
     for node in ast.walk(tree):
-        if not isinstance(node, ast.Call):
-            continue
-        func = node.func
-        if isinstance(func, ast.Name) and func.id == "setup":
-            return node
-        if (
-            isinstance(func, ast.Attribute)
-            and func.attr == "setup"
-            and isinstance(func.value, ast.Name)
-        ):
+        if _is_setup_call(node):
             return node
     return None
 
@@ -71,15 +138,13 @@ def _ast_to_str(node: ast.expr) -> str | None:
 
 
 def _ast_to_str_list(node: ast.expr) -> list[str] | None:
-    if isinstance(node, (ast.List, ast.Tuple)):
-        result = []
-        for elt in node.elts:
-            s = _ast_to_str(elt)
-            if s is None:
-                return None
-            result.append(s)
-        return result
-    return None
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return None
+    elts = node.elts
+    # Exact type checks are safe (ast.parse only produces ast.Constant itself)
+    if not all(type(e) is ast.Constant and type(e.value) is str for e in elts):
+        return None
+    return [e.value for e in elts]
 
 
 def _ast_to_dict_of_str_lists(node: ast.expr) -> dict[str, list[str]] | None:
@@ -102,97 +167,365 @@ def _ast_to_dict_of_str_lists(node: ast.expr) -> dict[str, list[str]] | None:
 # ---------------------------------------------------------------------------
 
 
-def parse_setup_py(path: Path) -> ProjectMetadata:
-    """AST-parse a setup.py to extract setup() keyword arguments."""
-    meta = ProjectMetadata(sources=["setup.py"])
+def _file_key(path: Path) -> tuple[str, int, int]:
+    st = path.stat()
+    return (str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+def _keys_current(keys: tuple[tuple[str, int, int], ...]) -> bool:
+    try:
+        for resolved, mtime_ns, size in keys:
+            st = os.stat(resolved)
+            if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _copy_metadata(meta: ProjectMetadata) -> ProjectMetadata:
+    return ProjectMetadata(
+        name=meta.name,
+        version=meta.version,
+        description=meta.description,
+        requires_python=meta.requires_python,
+        dependencies=list(meta.dependencies),
+        optional_dependencies={k: list(v) for k, v in meta.optional_dependencies.items()},
+        entry_points=dict(meta.entry_points),
+        sources=list(meta.sources),
+        warnings=list(meta.warnings),
+    )
+
+
+def _stat_cached(
+    parse: Callable[..., tuple[ProjectMetadata, tuple[tuple[str, int, int], ...]]],
+) -> Callable[..., ProjectMetadata]:
+    """Memoize a legacy-file parser for the life of the process.
+
+    The wrapped parser returns its metadata plus the _file_key of every file
+    it read (taken before reading). A cached result is reused while all of
+    those files are unchanged, so edits -- including to a requirements
+    include -- force a re-parse. An empty key tuple means "don't cache".
+    Callers get their own copy and may modify it. Use .cache_clear() to reset.
+    """
+    cache: dict[str, tuple[tuple[tuple[str, int, int], ...], ProjectMetadata]] = {}
+
+    @functools.wraps(parse)
+    def cached(path: Path, *args, **kwargs) -> ProjectMetadata:
+        slot = os.path.abspath(path)
+        entry = cache.get(slot)
+        if entry is not None and _keys_current(entry[0]):
+            return _copy_metadata(entry[1])
+        meta, keys = parse(path, *args, **kwargs)
+        if keys:
+            cache[slot] = (keys, _copy_metadata(meta))
+        return meta
+
+    cached.cache_clear = cache.clear
+    return cached
+
+
+def _load_toml(path: Path) -> dict:
+    """Load a TOML file through the stat-keyed cache; don't mutate the result.
+
+    Reads stay on tomllib (C-accelerated, stdlib); tomlkit is dramatically
+    slower to load and is only worth it for style-preserving round-trips.
+    """
+    key = _file_key(path)
+    data = _TOML_CACHE.get(key)
+    if data is None:
+        data = _TOML_CACHE[key] = tomllib.loads(path.read_bytes().decode("utf-8"))
+    return data
+
+
+def _setup_name(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_str(node)
+    if val is not None:
+        meta.name = val
+    else:
+        meta.warnings.append("setup.py: 'name' is dynamic, skipped")
+
+
+def _setup_version(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_str(node)
+    if val is not None:
+        meta.version = val
+    else:
+        meta.warnings.append("setup.py: 'version' is dynamic, skipped")
 
+
+def _setup_description(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_str(node)
+    if val is not None:
+        meta.description = val
+
+
+def _setup_python_requires(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_str(node)
+    if val is not None:
+        meta.requires_python = val
+
+
+def _setup_install_requires(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_str_list(node)
+    if val is not None:
+        meta.dependencies = val
+    else:
+        meta.warnings.append("setup.py: 'install_requires' is dynamic, skipped")
+
+
+def _setup_extras_require(meta: ProjectMetadata, node: ast.expr) -> None:
+    val = _ast_to_dict_of_str_lists(node)
+    if val is not None:
+        meta.optional_dependencies = val
+
+
+def _setup_entry_points(meta: ProjectMetadata, node: ast.expr) -> None:
+    d = _ast_to_dict_of_str_lists(node)
+    if d and "console_scripts" in d:
+        for entry in d["console_scripts"]:
+            if "=" in entry:
+                name, _, target = entry.partition("=")
+                meta.entry_points[name.strip()] = target.strip()
+
+
+# setup() keyword -> handler that records it on the metadata
+_SETUP_KW_HANDLERS: dict[str, Callable[[ProjectMetadata, ast.expr], None]] = {
+    "name": _setup_name,
+    "version": _setup_version,
+    "description": _setup_description,
+    "python_requires": _setup_python_requires,
+    "install_requires": _setup_install_requires,
+    "extras_require": _setup_extras_require,
+    "entry_points": _setup_entry_points,
+}
+
+
+_NO_SETUP_CALL = "setup.py: no setup() call found"
+
+
+def _setup_py_cache_file(source: bytes) -> Path | None:
+    if len(source) > SETUP_PY_CACHE_MAX_SIZE:
+        return None
+    return SETUP_PY_CACHE_DIR / f"{hashlib.sha256(source).hexdigest()}.json"
+
+
+def _setup_py_cache_key() -> list:
+    return [SETUP_PY_CACHE_VERSION, *sys.version_info[:2]]
+
+
+def _read_setup_py_cache(cache_file: Path) -> ProjectMetadata | None:
     try:
-        source = path.read_text()
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached["key"] != _setup_py_cache_key():
+            return None
+        return ProjectMetadata(**cached["meta"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_setup_py_cache(cache_file: Path, meta: ProjectMetadata) -> None:
+    entry = {"key": _setup_py_cache_key(), "meta": asdict(meta)}
+    # Written by concurrent workers and runs alike: rename a private temp
+    # file into place so readers never see a partial entry.
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, cache_file)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+@_stat_cached
+def parse_setup_py(path: Path) -> tuple[ProjectMetadata, tuple[tuple[str, int, int], ...]]:
+    """AST-parse a setup.py to extract setup() keyword arguments.
+
+    Memoized per process by file stat (see _stat_cached), and cached on disk
+    under SETUP_PY_CACHE_DIR by source hash, so an identical file is only
+    ever parsed once.
+    """
+    keys = (_file_key(path),)
+    source = path.read_bytes()
+    # Without the name anywhere there can't be a setup() call, however it's
+    # spaced or qualified, so there's nothing to parse or cache.
+    if b"setup" not in source:
+        meta = ProjectMetadata(sources=["setup.py"])
+        meta.warnings.append(_NO_SETUP_CALL)
+        return meta, keys
+
+    cache_file = _setup_py_cache_file(source)
+    if cache_file is not None:
+        cached = _read_setup_py_cache(cache_file)
+        if cached is not None:
+            return cached, keys
+
+    try:
+        # Bytes let the parser honour PEP 263 coding cookies (default UTF-8)
         tree = ast.parse(source)
     except (SyntaxError, UnicodeDecodeError) as e:
+        meta = ProjectMetadata(sources=["setup.py"])
         meta.warnings.append(f"setup.py: could not parse ({e})")
-        return meta
+        return meta, keys
+
+    meta = _setup_py_metadata(tree)
+    if cache_file is not None:
+        _write_setup_py_cache(cache_file, meta)
+    return meta, keys
+
+
+def _setup_py_metadata(tree: ast.Module) -> ProjectMetadata:
+    """Extract setup() keyword arguments from a parsed setup.py."""
+    meta = ProjectMetadata(sources=["setup.py"])
 
     call = _find_setup_call(tree)
     if call is None:
-        meta.warnings.append("setup.py: no setup() call found")
+        meta.warnings.append(_NO_SETUP_CALL)
         return meta
 
     for kw in call.keywords:
-        if kw.arg is None:
-            continue  # **kwargs
+        handler = _SETUP_KW_HANDLERS.get(kw.arg)  # kw.arg is None for **kwargs
+        if handler is not None:
+            handler(meta, kw.value)
 
-        if kw.arg == "name":
-            val = _ast_to_str(kw.value)
-            if val is not None:
-                meta.name = val
-            else:
-                meta.warnings.append("setup.py: 'name' is dynamic, skipped")
+    return meta
 
-        elif kw.arg == "version":
-            val = _ast_to_str(kw.value)
-            if val is not None:
-                meta.version = val
-            else:
-                meta.warnings.append("setup.py: 'version' is dynamic, skipped")
-
-        elif kw.arg == "description":
-            val = _ast_to_str(kw.value)
-            if val is not None:
-                meta.description = val
-
-        elif kw.arg == "python_requires":
-            val = _ast_to_str(kw.value)
-            if val is not None:
-                meta.requires_python = val
-
-        elif kw.arg == "install_requires":
-            val = _ast_to_str_list(kw.value)
-            if val is not None:
-                meta.dependencies = val
-            else:
-                meta.warnings.append(
-                    "setup.py: 'install_requires' is dynamic, skipped"
-                )
-
-        elif kw.arg == "extras_require":
-            val = _ast_to_dict_of_str_lists(kw.value)
-            if val is not None:
-                meta.optional_dependencies = val
-
-        elif kw.arg == "entry_points":
-            d = _ast_to_dict_of_str_lists(kw.value)
-            if d and "console_scripts" in d:
-                for entry in d["console_scripts"]:
-                    if "=" in entry:
-                        name, _, target = entry.partition("=")
-                        meta.entry_points[name.strip()] = target.strip()
 
-    return meta
+# Idle parsers shared by all threads; see _borrow_parser
+_CFG_POOL: queue.SimpleQueue[configparser.ConfigParser] = queue.SimpleQueue()
+
+
+def _borrow_parser() -> configparser.ConfigParser:
+    """Take a reset parser from the pool, or build one if none are idle.
+
+    ConfigParser isn't thread-safe, but each borrowed parser is used by one
+    caller at a time; hand it back with _CFG_POOL.put() when done.
+    """
+    try:
+        cfg = _CFG_POOL.get_nowait()
+    except queue.Empty:
+        return configparser.ConfigParser()
+    _reset_parser(cfg)
+    return cfg
+
+
+def _reset_parser(cfg: configparser.ConfigParser) -> None:
+    """Empty a parser for reuse; clear() alone keeps the DEFAULT section."""
+    cfg.clear()
+    cfg.defaults().clear()
+
+
+def _scan_setup_cfg(text: str) -> dict[str, dict[str, str]] | None:
+    """Read a plain setup.cfg without configparser, or return None if it isn't plain.
+
+    Follows ConfigParser's default rules (lowercased keys, '=' or ':'
+    delimiters, full-line '#'/';' comments, indented continuation lines,
+    blank lines kept inside values). Anything beyond that -- interpolation,
+    a DEFAULT section, duplicates, malformed lines -- returns None so the
+    caller can defer to the real parser, which also reports the errors.
+    """
+    if "%" in text:
+        return None
+
+    sections: dict[str, dict[str, list[str]]] = {}
+    section: dict[str, list[str]] | None = None
+    option: str | None = None
+    option_indent = 0
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            if not line and section is not None and option is not None:
+                section[option].append("")
+            continue
+
+        indent = len(raw) - len(raw.lstrip())
+        if section is not None and option is not None and indent > option_indent:
+            section[option].append(line)
+            continue
+        option_indent = indent
+
+        if line[0] == "[":
+            name = line[1:-1]
+            if line[-1] != "]" or not name or name == "DEFAULT" or name in sections:
+                return None
+            section = sections[name] = {}
+            option = None
+            continue
+
+        if section is None:
+            return None
+        delims = [i for i in (line.find("="), line.find(":")) if i != -1]
+        if not delims:
+            return None
+        cut = min(delims)
+        key = line[:cut].rstrip().lower()
+        if not key or key in section:
+            return None
+        section[key] = [line[cut + 1 :].strip()]
+        option = key
+
+    return {
+        name: {key: "\n".join(lines).rstrip() for key, lines in opts.items()}
+        for name, opts in sections.items()
+    }
 
 
-def parse_setup_cfg(path: Path) -> ProjectMetadata:
-    """Parse a setup.cfg file using configparser."""
+@_stat_cached
+def parse_setup_cfg(
+    path: Path, cfg: configparser.ConfigParser | None = None,
+) -> tuple[ProjectMetadata, tuple[tuple[str, int, int], ...]]:
+    """Parse a setup.cfg file.
+
+    Plain files are read by a small scanner; anything else goes through
+    configparser. Pass cfg to reuse a specific parser (it is reset first);
+    otherwise one is borrowed from a shared pool instead of constructing a
+    new one per call. Memoized per process by file stat (see _stat_cached).
+    """
     meta = ProjectMetadata(sources=["setup.cfg"])
 
-    cfg = configparser.ConfigParser()
     try:
-        cfg.read(path, encoding="utf-8")
+        keys = (_file_key(path),)
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return meta, ()  # configparser.read() silently skips unreadable files too
     except Exception as e:
         meta.warnings.append(f"setup.cfg: could not parse ({e})")
-        return meta
+        return meta, ()
+
+    sections = _scan_setup_cfg(text)
+    if sections is None:
+        pooled = cfg is None
+        if pooled:
+            cfg = _borrow_parser()
+        else:
+            _reset_parser(cfg)
+        try:
+            cfg.read_string(text, source=str(path))
+            sections = {name: dict(cfg[name]) for name in cfg.sections()}
+        except Exception as e:
+            meta.warnings.append(f"setup.cfg: could not parse ({e})")
+            return meta, keys
+        finally:
+            if pooled:
+                _CFG_POOL.put(cfg)
 
     # [metadata]
-    if cfg.has_section("metadata"):
-        meta.name = cfg.get("metadata", "name", fallback=None)
-        meta.version = cfg.get("metadata", "version", fallback=None)
-        meta.description = cfg.get("metadata", "description", fallback=None)
+    if "metadata" in sections:
+        metadata = sections["metadata"]
+        meta.name = metadata.get("name")
+        meta.version = metadata.get("version")
+        meta.description = metadata.get("description")
 
     # [options]
-    if cfg.has_section("options"):
-        meta.requires_python = cfg.get("options", "python_requires", fallback=None)
+    if "options" in sections:
+        options = sections["options"]
+        meta.requires_python = options.get("python_requires")
 
-        raw = cfg.get("options", "install_requires", fallback=None)
+        raw = options.get("install_requires")
         if raw:
             meta.dependencies = [
                 line.strip()
@@ -201,100 +534,137 @@ def parse_setup_cfg(path: Path) -> ProjectMetadata:
             ]
 
     # [options.extras_require]
-    if cfg.has_section("options.extras_require"):
-        for key in cfg.options("options.extras_require"):
-            raw = cfg.get("options.extras_require", key)
-            deps = [line.strip() for line in raw.strip().splitlines() if line.strip()]
-            if deps:
-                meta.optional_dependencies[key] = deps
+    for key, raw in sections.get("options.extras_require", {}).items():
+        deps = [line.strip() for line in raw.strip().splitlines() if line.strip()]
+        if deps:
+            meta.optional_dependencies[key] = deps
 
     # [options.entry_points]
-    if cfg.has_section("options.entry_points"):
-        raw = cfg.get("options.entry_points", "console_scripts", fallback=None)
-        if raw:
-            for line in raw.strip().splitlines():
-                line = line.strip()
-                if line and "=" in line:
-                    name, _, target = line.partition("=")
-                    meta.entry_points[name.strip()] = target.strip()
+    raw = sections.get("options.entry_points", {}).get("console_scripts")
+    if raw:
+        for line in raw.strip().splitlines():
+            line = line.strip()
+            if line and "=" in line:
+                name, _, target = line.partition("=")
+                meta.entry_points[name.strip()] = target.strip()
 
-    return meta
+    return meta, keys
 
 
+@_stat_cached
 def parse_requirements_txt(
-    path: Path, *, _visited: set[Path] | None = None,
-) -> ProjectMetadata:
-    """Parse a requirements.txt file into dependency list."""
-    meta = ProjectMetadata(sources=["requirements.txt"])
+    path: Path,
+) -> tuple[ProjectMetadata, tuple[tuple[str, int, int], ...]]:
+    """Parse a requirements.txt file into dependency list.
 
-    if _visited is None:
-        _visited = set()
-
-    resolved = path.resolve()
-    if resolved in _visited:
-        return meta
-    _visited.add(resolved)
-
-    try:
-        lines = path.read_text().splitlines()
-    except Exception as e:
-        meta.warnings.append(f"requirements.txt: could not read ({e})")
-        return meta
+    `-r` includes are followed in place (each file at most once) using an
+    explicit stack of open line iterators, so dependencies keep file order.
+    Memoized per process by the stat of every file read (see _stat_cached).
+    """
+    meta = ProjectMetadata(sources=["requirements.txt"])
+    keys: list[tuple[str, int, int]] = []
+    cacheable = True
+    # Paths as written, then canonical paths: repeated includes of the same
+    # spelling (e.g. common.txt) are skipped without another realpath call,
+    # while different spellings of one file still dedupe via resolve().
+    seen: set[Path] = set()
+    visited: set[Path] = set()
+    stack: list[tuple[Path, Iterator[str]]] = []
+
+    def enter(p: Path) -> None:
+        nonlocal cacheable
+        if p in seen:
+            return
+        seen.add(p)
+        resolved = p.resolve()
+        if resolved in visited:
+            return
+        visited.add(resolved)
+        try:
+            st = os.stat(resolved)
+            keys.append((str(resolved), st.st_mtime_ns, st.st_size))
+            lines = p.read_text(encoding="utf-8").splitlines()
+        except Exception as e:
+            cacheable = False  # a missing include may appear later
+            meta.warnings.append(f"requirements.txt: could not read ({e})")
+            return
+        stack.append((p, iter(lines)))
+
+    # Bound once: these run for every line
+    add_dep = meta.dependencies.append
+    add_warning = meta.warnings.append
+
+    enter(path)
+    while stack:
+        current, lines = stack[-1]
+        raw_line = next(lines, None)
+        if raw_line is None:
+            stack.pop()
+            continue
 
-    for raw_line in lines:
-        line = raw_line.split("#", 1)[0].strip()
+        hash_at = raw_line.find("#")
+        line = (raw_line if hash_at < 0 else raw_line[:hash_at]).strip()
         if not line:
             continue
 
-        if line.startswith(("-r", "--requirement")):
+        # Plain requirements (by far the common case) skip the option checks
+        if line[0] != "-":
+            add_dep(line)
+            continue
+
+        if line.startswith(_REQ_INCLUDE_PREFIXES):
             parts = line.split(None, 1)
             if len(parts) == 2:
-                inc_path = path.parent / parts[1]
-                sub = parse_requirements_txt(inc_path, _visited=_visited)
-                meta.dependencies.extend(sub.dependencies)
-                meta.warnings.extend(sub.warnings)
+                enter(current.parent / parts[1])
             continue
 
-        if line.startswith(("-e", "--editable")):
-            meta.warnings.append(f"requirements.txt: editable dep skipped: {line}")
+        if line.startswith(_REQ_EDITABLE_PREFIXES):
+            add_warning(f"requirements.txt: editable dep skipped: {line}")
             continue
 
-        if line.startswith(("-i", "--index-url", "--extra-index-url", "--find-links",
-                            "--no-binary", "--only-binary", "--trusted-host",
-                            "-f", "--pre", "--no-deps")):
+        if line.startswith(_REQ_SKIP_PREFIXES):
             continue
 
         # Treat as a PEP 508 dependency string
-        meta.dependencies.append(line)
+        add_dep(line)
 
-    return meta
+    return meta, tuple(keys) if cacheable else ()
 
 
 def parse_existing_pyproject(path: Path) -> ProjectMetadata:
     """Read an existing pyproject.toml and extract [project] fields."""
+    return _read_existing_pyproject(path)[0]
+
+
+def _read_existing_pyproject(path: Path) -> tuple[ProjectMetadata, dict | None]:
+    """parse_existing_pyproject, also returning the parsed document.
+
+    The document is None if the file couldn't be read. It's the shared
+    cached parse, so it must not be modified.
+    """
     meta = ProjectMetadata(sources=["pyproject.toml"])
 
     try:
-        with open(path, "rb") as f:
-            data = tomllib.load(f)
+        data = _load_toml(path)
     except Exception as e:
         meta.warnings.append(f"pyproject.toml: could not parse ({e})")
-        return meta
+        return meta, None
 
+    # Copy lists out of the (cached, shared) parse result
     project = data.get("project", {})
     meta.name = project.get("name")
     meta.version = project.get("version")
     meta.description = project.get("description")
     meta.requires_python = project.get("requires-python")
-    meta.dependencies = project.get("dependencies", [])
+    meta.dependencies = list(project.get("dependencies", []))
 
     for group, deps in project.get("optional-dependencies", {}).items():
-        meta.optional_dependencies[group] = deps
+        meta.optional_dependencies[group] = list(deps)
 
     for name, target in project.get("scripts", {}).items():
         meta.entry_points[name] = target
 
-    return meta
+    return meta, data
 
 
 # ---------------------------------------------------------------------------
@@ -309,48 +679,58 @@ def merge_metadata(sources: list[ProjectMetadata]) -> ProjectMetadata:
     Scalars: first non-None wins. Dependencies: highest-priority non-empty wins.
     """
     merged = ProjectMetadata()
+    # The containers are filled in place, so bind their methods once
+    add_sources = merged.sources.extend
+    add_warnings = merged.warnings.extend
+    add_group = merged.optional_dependencies.setdefault
+    add_entry_point = merged.entry_points.setdefault
 
     for src in sources:
-        merged.sources.extend(src.sources)
-        merged.warnings.extend(src.warnings)
+        add_sources(src.sources)
+        add_warnings(src.warnings)
 
-    for src in sources:
-        if merged.name is None and src.name is not None:
+        if merged.name is None:
             merged.name = src.name
-        if merged.version is None and src.version is not None:
+        if merged.version is None:
             merged.version = src.version
-        if merged.description is None and src.description is not None:
+        if merged.description is None:
             merged.description = src.description
-        if merged.requires_python is None and src.requires_python is not None:
+        if merged.requires_python is None:
             merged.requires_python = src.requires_python
 
-    # Dependencies: highest-priority non-empty list wins
-    for src in sources:
-        if src.dependencies:
-            merged.dependencies = src.dependencies
-            break
+        # Dependencies: highest-priority non-empty list wins, minus exact
+        # repeats (e.g. one pin reached through two -r includes)
+        if not merged.dependencies and src.dependencies:
+            merged.dependencies = list(dict.fromkeys(src.dependencies))
 
-    # Optional deps: merge by group, higher priority wins per group
-    for src in reversed(sources):  # lowest priority first so higher overwrites
+        # Optional deps by group and entry points by name: higher priority wins
         for group, deps in src.optional_dependencies.items():
-            merged.optional_dependencies[group] = deps
-
-    # Entry points: merge, higher priority wins per name
-    for src in reversed(sources):
+            add_group(group, deps)
         for name, target in src.entry_points.items():
-            merged.entry_points[name] = target
+            add_entry_point(name, target)
 
     return merged
 
 
 def _deep_merge(base: dict, overlay: dict) -> dict:
-    """Merge overlay into base; base values take precedence."""
+    """Merge overlay into base; base values take precedence.
+
+    Neither input is modified: only the dicts along paths that the overlay
+    actually extends are copied, everything else is shared with base.
+    """
     result = dict(base)
-    for key, value in overlay.items():
-        if key not in result:
-            result[key] = value
-        elif isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
+    stack = [(result, overlay)]
+    push, pop = stack.append, stack.pop
+    while stack:
+        dst, src = pop()
+        get = dst.get
+        for key, value in src.items():
+            current = get(key, _MISSING)
+            if current is _MISSING:
+                dst[key] = value
+            elif isinstance(current, dict) and isinstance(value, dict):
+                dst[key] = copied = dict(current)
+                push((copied, value))
     return result
 
 
@@ -359,7 +739,7 @@ def build_pyproject_dict(metadata: ProjectMetadata, project_dir_name: str) -> di
     project: dict = {
         "name": metadata.name or project_dir_name,
         "version": metadata.version or "0.1.0",
-        "requires-python": metadata.requires_python or ">=3.10",
+        "requires-python": metadata.requires_python or _DEFAULT_REQUIRES_PYTHON,
     }
 
     if metadata.description:
@@ -374,27 +754,148 @@ def build_pyproject_dict(metadata: ProjectMetadata, project_dir_name: str) -> di
     if metadata.entry_points:
         project["scripts"] = metadata.entry_points
 
-    return {
-        "build-system": {
-            "requires": ["hatchling"],
-            "build-backend": "hatchling.build",
-        },
-        "project": project,
-    }
+    build_system = _BUILD_SYSTEM.copy()
+    build_system["requires"] = list(build_system["requires"])
+    return {"build-system": build_system, "project": project}
+
+
+def _toml_str(value: str) -> str | None:
+    # Only backslash and quote are escaped here; strings needing more
+    # (newlines, control characters) are left to tomli_w
+    if not value.isprintable():
+        return None
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _toml_key(key: str) -> str | None:
+    if key and _BARE_KEY_CHARS.issuperset(key):
+        return key
+    return _toml_str(key)
+
+
+def _toml_value(value: object) -> str | None:
+    if isinstance(value, str):
+        return _toml_str(value)
+    if not isinstance(value, list):
+        return None
+    if not value:
+        return "[]"
+    items = []
+    for item in value:
+        item = _toml_str(item) if isinstance(item, str) else None
+        if item is None:
+            return None
+        items.append(f"    {item},\n")
+    return "[\n" + "".join(items) + "]"
+
+
+def _fast_dumps(data: dict) -> str | None:
+    """Serialize a document shaped like build_pyproject_dict's output.
 
+    Only [build-system] and [project] are handled, holding strings, lists
+    of strings and one level of sub-tables of those (optional-dependencies,
+    scripts). Anything else returns None so the caller can use tomli_w,
+    whose layout the output matches.
+    """
+    if not _FAST_TOML_TABLES.issuperset(data):
+        return None
 
-def write_pyproject(project_dir: Path, data: dict) -> None:
-    """Write pyproject.toml, merging with existing content if present."""
+    lines: list[str] = []
+    add = lines.append
+    for name, table in data.items():
+        if not isinstance(table, dict):
+            return None
+        literals = []
+        subtables = []
+        for key, value in table.items():
+            if isinstance(value, dict):
+                subtables.append((key, value))
+                continue
+            key, value = _toml_key(key), _toml_value(value)
+            if key is None or value is None:
+                return None
+            literals.append(f"{key} = {value}\n")
+        # Like tomli_w, a table holding only sub-tables gets no header
+        if literals or not subtables:
+            add(f"[{name}]\n")
+            lines += literals
+            add("\n")
+        for sub_name, subtable in subtables:
+            sub_name = _toml_key(sub_name)
+            if sub_name is None:
+                return None
+            add(f"[{name}.{sub_name}]\n")
+            for key, value in subtable.items():
+                key, value = _toml_key(key), _toml_value(value)
+                if key is None or value is None:
+                    return None
+                add(f"{key} = {value}\n")
+            add("\n")
+    return "".join(lines[:-1])
+
+
+def _dump_toml(path: Path, data: dict) -> None:
+    # Write a private temp file and rename it into place, so a failed or
+    # interrupted write never leaves a truncated pyproject.toml behind. The
+    # rename replaces whatever is at the path, so follow symlinks first and
+    # carry the existing file's mode over, as an in-place write would.
+    path = Path(os.path.realpath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    # Generated documents are small and of a known shape, so they're built
+    # directly and written with one os.write; tomli_w's per-value dispatch
+    # costs more than the write.
+    text = _fast_dumps(data)
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if mode is not None:
+                os.fchmod(fd, mode)
+            if text is not None:
+                view = memoryview(text.encode())
+                while view:
+                    view = view[os.write(fd, view):]
+            else:
+                # tomli_w.dump encodes and writes table by table, so the
+                # whole document never exists as one str plus one bytes copy
+                with open(fd, "wb", closefd=False) as f:
+                    tomli_w.dump(data, f)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_pyproject(project_dir: Path, data: dict, existing: dict | None = None) -> None:
+    """Write pyproject.toml, merging with existing content if present.
+
+    Pass existing to merge with an already-parsed pyproject.toml rather
+    than reading it again.
+    """
     pyproject = project_dir / "pyproject.toml"
 
-    if pyproject.exists():
-        with open(pyproject, "rb") as f:
-            existing = tomllib.load(f)
-        merged = _deep_merge(existing, data)
-    else:
-        merged = data
+    if existing is None:
+        # Usually already parsed (and cached) by parse_existing_pyproject;
+        # the cache lookup's stat doubles as the existence check.
+        try:
+            existing = _load_toml(pyproject)
+        except FileNotFoundError:
+            _dump_toml(pyproject, data)
+            return
 
-    pyproject.write_bytes(tomli_w.dumps(merged).encode())
+    # The merge only copies the tables `data` touches (build-system,
+    # project); everything else, e.g. a large [tool] tree, is shared, not
+    # copied. The cached parse must stay unmodified, so don't merge into it
+    # in place.
+    _dump_toml(pyproject, _deep_merge(existing, data))
 
 
 # ---------------------------------------------------------------------------
@@ -406,14 +907,15 @@ def migrate_project(project_dir: Path, *, clean: bool = False) -> MigrationResul
     """Migrate a single project from legacy config to pyproject.toml."""
     result = MigrationResult(project_name=project_dir.name)
 
-    # Detect legacy files
-    legacy_found: dict[str, Path] = {}
-    for name in LEGACY_FILES:
-        p = project_dir / name
-        if p.exists():
-            legacy_found[name] = p
+    # Detect legacy files with one directory listing rather than a stat each
+    try:
+        with os.scandir(project_dir) as it:
+            entries = {e.name for e in it}
+    except OSError:
+        entries = set()
 
-    has_pyproject = (project_dir / "pyproject.toml").exists()
+    legacy_found = {name: project_dir / name for name in LEGACY_FILES if name in entries}
+    has_pyproject = "pyproject.toml" in entries
 
     if not legacy_found and not has_pyproject:
         result.skipped = True
@@ -428,8 +930,10 @@ def migrate_project(project_dir: Path, *, clean: bool = False) -> MigrationResul
     # Parse each source in priority order
     parsed: list[ProjectMetadata] = []
 
+    existing = None
     if has_pyproject:
-        parsed.append(parse_existing_pyproject(project_dir / "pyproject.toml"))
+        meta, existing = _read_existing_pyproject(project_dir / "pyproject.toml")
+        parsed.append(meta)
 
     for source_name in ["setup.cfg", "setup.py", "requirements.txt"]:
         if source_name in legacy_found:
@@ -445,7 +949,7 @@ def migrate_project(project_dir: Path, *, clean: bool = False) -> MigrationResul
     result.warnings = metadata.warnings
 
     pyproject_data = build_pyproject_dict(metadata, project_dir.name)
-    write_pyproject(project_dir, pyproject_data)
+    write_pyproject(project_dir, pyproject_data, existing)
 
     # Cleanup
     if clean:
@@ -456,6 +960,19 @@ def migrate_project(project_dir: Path, *, clean: bool = False) -> MigrationResul
     return result
 
 
+def _migration_pool(n_projects: int) -> Executor:
+    cpus = os.cpu_count() or 1
+    if n_projects >= MIGRATE_PROCESS_THRESHOLD and cpus > 1:
+        # spawn, not fork: the parent may already be running threads
+        return ProcessPoolExecutor(
+            max_workers=min(cpus, n_projects),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    # I/O dominates for small workspaces; setup.cfg parsers are borrowed
+    # from the shared pool, one per call in flight
+    return ThreadPoolExecutor(max_workers=min(32, cpus * 4, max(1, n_projects)))
+
+
 def migrate_projects(
     workspace_root: Path,
     project_names: tuple[str, ...] | None,
@@ -463,34 +980,69 @@ def migrate_projects(
     clean: bool = False,
 ) -> None:
     """Migrate legacy Python projects to pyproject.toml."""
-    subdirs = sorted(
-        p for p in workspace_root.iterdir()
-        if p.is_dir() and not p.name.startswith(".")
-    )
-    if project_names is not None:
-        subdirs = [d for d in subdirs if d.name in project_names]
+    with os.scandir(workspace_root) as it:
+        subdirs = sorted(
+            Path(e.path) for e in it
+            if not e.name.startswith(".")
+            and (project_names is None or e.name in project_names)
+            and e.is_dir()
+        )
+
+    # Projects are independent, so migrate them concurrently. A partial (not
+    # a closure) so it can be sent to worker processes.
+    migrate_one = functools.partial(migrate_project, clean=clean)
 
     migrated = 0
     skipped = 0
+    failed: list[tuple[str, BaseException]] = []
 
-    for subdir in subdirs:
-        result = migrate_project(subdir, clean=clean)
+    pool = _migration_pool(len(subdirs))
+    try:
+        futures = [pool.submit(migrate_one, subdir) for subdir in subdirs]
+        # Wait for every project rather than stopping at the first failure:
+        # the others are written (and, with clean, their legacy files
+        # removed) regardless, so all of them get reported.
+        outcomes = [future.exception() or future.result() for future in futures]
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    # Report in sorted project order once everything has been written
+    for subdir, result in zip(subdirs, outcomes):
+        if isinstance(result, BaseException):
+            failed.append((subdir.name, result))
+            click.echo(
+                f"\n{click.style(subdir.name, bold=True)}:\n"
+                f"  {click.style('error', fg='red')}: {result}"
+            )
+            continue
 
         if result.skipped:
             skipped += 1
             continue
 
         migrated += 1
-        click.echo(f"\n{click.style(result.project_name, bold=True)}:")
-        click.echo(f"  found: {', '.join(result.sources_found)}")
+        # One write per project rather than one per line
+        lines = [
+            f"\n{click.style(result.project_name, bold=True)}:",
+            f"  found: {', '.join(result.sources_found)}",
+        ]
 
         if result.warnings:
             for w in result.warnings:
-                click.echo(f"  {click.style('warning', fg='yellow')}: {w}")
+                lines.append(f"  {click.style('warning', fg='yellow')}: {w}")
 
-        click.echo(f"  wrote pyproject.toml")
+        lines.append("  wrote pyproject.toml")
 
         if result.files_removed:
-            click.echo(f"  removed: {', '.join(result.files_removed)}")
+            lines.append(f"  removed: {', '.join(result.files_removed)}")
+
+        click.echo("\n".join(lines))
+
+    summary = f"\nMigrated {migrated} project(s). {skipped} skipped."
+    if failed:
+        summary += f" {len(failed)} failed."
+    click.echo(summary)
 
-    click.echo(f"\nMigrated {migrated} project(s). {skipped} skipped.")
+    if failed:
+        names = ", ".join(name for name, _ in failed)
+        raise click.ClickException(f"Migration failed for {names}") from failed[0][1]
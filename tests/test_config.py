@@ -10,6 +10,7 @@ from workman.config import (
     get_docker_projects,
     get_effective_latest_tag,
     load_config,
+    resolve_build_plan,
     resolve_projects,
 )
 
@@ -184,6 +185,11 @@ class TestLoadConfig:
         lib = ws.projects["lib"]
         assert lib.images == []
 
+    def test_does_not_write_to_workspace(self, tmp_path):
+        _write_config(tmp_path, {"projects": {"app": {}}})
+        load_config(tmp_path)
+        assert [p.name for p in tmp_path.iterdir()] == [".workman.yaml"]
+
 
 class TestGetBuildContext:
     def test_defaults_to_project_path(self):
@@ -247,6 +253,22 @@ class TestGetDockerProjects:
             get_docker_projects(ws, ("nope",))
 
 
+class TestResolveBuildPlan:
+    def test_resolves_latest_tags(self, tmp_path):
+        _write_config(tmp_path, {
+            "latest_tag": "prod",
+            "projects": {
+                "a": {"images": [{"name": "a"}]},
+                "b": {"latest_tag": "edge", "images": [{"name": "b"}]},
+                "empty": {},
+            },
+        })
+        ws = load_config(tmp_path)
+        plan = resolve_build_plan(ws)
+        assert [p.name for p in plan.projects] == ["a", "b"]
+        assert plan.latest_tags == {"a": "prod", "b": "edge"}
+
+
 class TestLoadGroups:
     def test_no_groups(self, tmp_path):
         _write_config(tmp_path, {"projects": {"a": {}}})
@@ -1,4 +1,8 @@
+import http.client
 import json
+import os
+import threading
+import urllib.error
 from pathlib import Path
 from unittest.mock import patch
 
@@ -7,14 +11,17 @@ from packaging.version import Version
 
 from workman.deps import (
     OutdatedInfo,
+    _fetch,
     _is_simple_gte,
     _parse_deps,
     _update_dep_line,
+    _update_dep_lines,
     align_dependencies,
     find_mismatches,
     find_outdated,
     get_latest_version,
     highest_minimum,
+    scan_and_find_outdated,
     scan_dependencies,
     upgrade_dependencies,
 )
@@ -40,6 +47,12 @@ dev = [
 """
 
 
+@pytest.fixture(autouse=True)
+def _isolated_pypi_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("workman.deps.PYPI_CACHE_DIR", tmp_path / ".pypi-cache")
+    get_latest_version.cache_clear()
+
+
 def _make_project(tmp_path: Path, name: str, *, main=(), opt=(), dev=()):
     proj = tmp_path / name
     proj.mkdir()
@@ -62,10 +75,18 @@ class TestParseDeps:
         result = _parse_deps(["PyYAML>=6.0"])
         assert "pyyaml" in result
 
+    def test_normalizes_separators(self):
+        result = _parse_deps(["typing_extensions>=4.0", "zope.interface[test]>=6.0"])
+        assert result == {"typing-extensions": ">=4.0", "zope-interface": ">=6.0"}
+
     def test_no_specifier(self):
         result = _parse_deps(["requests"])
         assert result == {"requests": ""}
 
+    def test_extras_and_markers(self):
+        result = _parse_deps(["uvicorn[standard]>=0.30", "tomli>=2.0; python_version<'3.11'"])
+        assert result == {"uvicorn": ">=0.30", "tomli": ">=2.0"}
+
     def test_skips_invalid(self):
         result = _parse_deps(["valid>=1.0", "not a valid dep!!!"])
         assert "valid" in result
@@ -107,6 +128,39 @@ class TestScanDependencies:
         result = scan_dependencies(tmp_path)
         assert result == {}
 
+    def test_caches_parsed_deps(self, tmp_path):
+        _make_project(tmp_path, "proj", main=["click>=8.0"])
+        scan_dependencies(tmp_path)
+        assert (tmp_path / ".workman" / "depcache" / "proj.json").exists()
+
+        with patch("workman.deps._parse_pyproject_deps") as mock_parse:
+            result = scan_dependencies(tmp_path)
+        mock_parse.assert_not_called()
+        assert result == {"click": {"proj": ">=8.0"}}
+
+    def test_cache_invalidated_on_change(self, tmp_path):
+        _make_project(tmp_path, "proj", main=["click>=8.0"])
+        scan_dependencies(tmp_path)
+
+        pyproject = tmp_path / "proj" / "pyproject.toml"
+        pyproject.write_text(pyproject.read_text().replace("click>=8.0", "click>=8.1.7"))
+        result = scan_dependencies(tmp_path)
+        assert result == {"click": {"proj": ">=8.1.7"}}
+
+    def test_skips_non_string_entries(self, tmp_path):
+        proj = tmp_path / "proj"
+        proj.mkdir()
+        (proj / "pyproject.toml").write_text(
+            '[project]\n'
+            'name = "proj"\n'
+            'dependencies = [1, "click>=8.0"]\n'
+            '\n'
+            '[project.optional-dependencies]\n'
+            'extra = [{ path = "../lib" }, "rich>=13"]\n'
+        )
+        result = scan_dependencies(tmp_path)
+        assert result == {"click": {"proj": ">=8.0"}, "rich": {"proj": ">=13"}}
+
 
 class TestFindMismatches:
     def test_no_mismatches(self):
@@ -175,6 +229,28 @@ class TestUpdateDepLine:
         result = _update_dep_line(content, "click", ">=8.0")
         assert "Click>=8.0" in result
 
+    def test_separator_insensitive(self):
+        content = 'dependencies = [\n    "typing_extensions>=4.0",\n]'
+        result = _update_dep_line(content, "typing-extensions", ">=4.12")
+        assert '"typing_extensions>=4.12"' in result
+
+    def test_ignores_longer_names(self):
+        content = 'dependencies = [\n    "click>=7.0",\n    "clickhouse-driver>=0.2",\n]'
+        result = _update_dep_line(content, "click", ">=8.0")
+        assert '"click>=8.0"' in result
+        assert '"clickhouse-driver>=0.2"' in result
+
+    def test_preserves_extras(self):
+        content = 'dependencies = [\n    "uvicorn[standard]>=0.20",\n]'
+        result = _update_dep_line(content, "uvicorn", ">=0.30")
+        assert '"uvicorn[standard]>=0.30"' in result
+
+    def test_updates_several_packages(self):
+        content = 'dependencies = [\n    "click>=7.0",\n    "requests",\n]'
+        result = _update_dep_lines(content, {"click": ">=8.0", "requests": ">=2.32"})
+        assert '"click>=8.0"' in result
+        assert '"requests>=2.32"' in result
+
 
 class TestAlignDependencies:
     def test_updates_files(self, tmp_path):
@@ -200,6 +276,98 @@ class TestAlignDependencies:
         assert (tmp_path / "a" / "pyproject.toml").read_text() == original_a
         assert (tmp_path / "b" / "pyproject.toml").read_text() == original_b
 
+    def test_multiple_packages_in_one_file(self, tmp_path):
+        _make_project(tmp_path, "a", main=["requests>=2.28.0", "click>=7.0"])
+        _make_project(tmp_path, "b", main=["requests>=2.31.0", "click>=8.1"])
+
+        mismatches = {
+            "requests": {"a": ">=2.28.0", "b": ">=2.31.0"},
+            "click": {"a": ">=7.0", "b": ">=8.1"},
+        }
+        align_dependencies(tmp_path, mismatches)
+
+        content_a = (tmp_path / "a" / "pyproject.toml").read_text()
+        assert '"requests>=2.31.0"' in content_a
+        assert '"click>=8.1"' in content_a
+
+    def test_only_touches_dependency_strings(self, tmp_path):
+        proj = tmp_path / "a"
+        proj.mkdir()
+        (proj / "pyproject.toml").write_text(
+            '[project]\n'
+            'name = "a"\n'
+            '# keep requests>=2.28.0 until the proxy is fixed\n'
+            'dependencies = [\n'
+            '    "requests>=2.28.0; python_version >= \'3.10\'",\n'
+            ']\n'
+            '\n'
+            '[tool.docs]\n'
+            'url = "https://example.com/requests"\n'
+        )
+        _make_project(tmp_path, "b", main=["requests>=2.31.0"])
+
+        mismatches = {"requests": {"a": ">=2.28.0", "b": ">=2.31.0"}}
+        align_dependencies(tmp_path, mismatches)
+
+        content = (proj / "pyproject.toml").read_text()
+        assert "\"requests>=2.31.0; python_version >= '3.10'\"" in content
+        assert "# keep requests>=2.28.0 until" in content
+        assert 'url = "https://example.com/requests"' in content
+
+    def test_leaves_same_literal_in_other_tables(self, tmp_path):
+        proj = tmp_path / "a"
+        proj.mkdir()
+        (proj / "pyproject.toml").write_text(
+            '[project]\n'
+            'name = "a"\n'
+            'keywords = ["click>=8.0"]\n'
+            'dependencies = [\n'
+            '    "click>=8.0",  # see [tool.uv]\n'
+            ']\n'
+            '\n'
+            '[dependency-groups]\n'
+            'dev = ["click>=8.0"]\n'
+            '\n'
+            '[tool.uv]\n'
+            'constraint-dependencies = ["click>=8.0"]\n'
+        )
+        _make_project(tmp_path, "b", main=["click>=8.1"])
+
+        align_dependencies(tmp_path, {"click": {"a": ">=8.0", "b": ">=8.1"}})
+
+        content = (proj / "pyproject.toml").read_text()
+        assert 'keywords = ["click>=8.0"]' in content
+        assert '    "click>=8.1",  # see [tool.uv]\n' in content
+        assert 'dev = ["click>=8.1"]' in content
+        assert 'constraint-dependencies = ["click>=8.0"]' in content
+
+    def test_skips_malformed_entries(self, tmp_path):
+        proj = tmp_path / "a"
+        proj.mkdir()
+        (proj / "pyproject.toml").write_text(
+            '[project]\n'
+            'name = "a"\n'
+            'dependencies = [1, "not a valid dep!!!", "requests>=2.28.0"]\n'
+        )
+        _make_project(tmp_path, "b", main=["requests>=2.31.0"])
+
+        mismatches = find_mismatches(scan_dependencies(tmp_path))
+        assert mismatches == {"requests": {"a": ">=2.28.0", "b": ">=2.31.0"}}
+        align_dependencies(tmp_path, mismatches)
+
+        content = (proj / "pyproject.toml").read_text()
+        assert 'dependencies = [1, "not a valid dep!!!", "requests>=2.31.0"]' in content
+
+    def test_replaces_spaced_specifier(self, tmp_path):
+        _make_project(tmp_path, "a", main=["requests >= 2.28.0"])
+        _make_project(tmp_path, "b", main=["requests>=2.31.0"])
+
+        mismatches = {"requests": {"a": ">=2.28.0", "b": ">=2.31.0"}}
+        align_dependencies(tmp_path, mismatches)
+
+        content_a = (tmp_path / "a" / "pyproject.toml").read_text()
+        assert '"requests>=2.31.0"' in content_a
+
 
 # ---------------------------------------------------------------------------
 # PyPI outdated / upgrade tests
@@ -207,48 +375,206 @@ class TestAlignDependencies:
 
 
 def _mock_pypi_response(version: str):
-    """Create a mock urlopen context manager returning a fake PyPI JSON response."""
-    data = json.dumps({"info": {"version": version}}).encode()
+    """Create a fake _fetch result for a PyPI /json response."""
+    return _mock_json_response({"info": {"version": version}})
+
+
+def _mock_simple_response(versions: list[str], yanked: tuple[str, ...] = ()):
+    """Create a fake _fetch result for the PEP 691 simple index."""
+    files = [
+        {"filename": f"pkg-{v}.tar.gz", "yanked": v in yanked} for v in versions
+    ]
+    return _mock_json_response({"versions": versions, "files": files})
+
+
+def _mock_json_response(
+    payload: dict, etag: str | None = None, last_modified: str | None = None,
+):
+    return json.dumps(payload).encode(), etag, last_modified
+
+
+class _FakeHTTPResponse:
+    def __init__(self, status: int, body: bytes = b"", headers: dict | None = None):
+        self.status = status
+        self.reason = "OK" if status == 200 else "Not Modified"
+        self.headers = headers or {}
+        self._body = body
+
+    def read(self):
+        return self._body
+
+    def getheader(self, name):
+        return self.headers.get(name)
+
+
+class _FakeHTTPSConnection:
+    """Stand-in for http.client.HTTPSConnection that serves queued responses."""
+
+    instances: list["_FakeHTTPSConnection"] = []
+    responses: list = []
 
-    class FakeResponse:
-        def read(self):
-            return data
+    def __init__(self, host, timeout=None):
+        self.host = host
+        self.requests = []
+        self.closed = False
+        _FakeHTTPSConnection.instances.append(self)
 
-        def __enter__(self):
-            return self
+    def request(self, method, target, headers=None):
+        self.requests.append((method, target, headers))
+        item = _FakeHTTPSConnection.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        self._response = item
 
-        def __exit__(self, *args):
-            pass
+    def getresponse(self):
+        return self._response
 
-    return FakeResponse()
+    def close(self):
+        self.closed = True
 
 
 class TestGetLatestVersion:
-    @patch("workman.deps.urllib.request.urlopen")
-    def test_returns_version(self, mock_urlopen):
-        mock_urlopen.return_value = _mock_pypi_response("2.32.3")
+    @patch("workman.deps._fetch")
+    def test_returns_version(self, mock_fetch):
+        mock_fetch.return_value = _mock_pypi_response("2.32.3")
         result = get_latest_version("requests")
         assert result == Version("2.32.3")
 
-    @patch("workman.deps.urllib.request.urlopen")
-    def test_returns_none_on_network_error(self, mock_urlopen):
-        mock_urlopen.side_effect = OSError("no network")
+    @patch("workman.deps._fetch")
+    def test_uses_simple_index(self, mock_fetch):
+        mock_fetch.return_value = _mock_simple_response(["2.31.0", "2.32.3", "3.0.0b1"])
+        assert get_latest_version("requests") == Version("2.32.3")
+        url, headers = mock_fetch.call_args[0]
+        assert url == "https://pypi.org/simple/requests/"
+        assert headers["Accept"] == "application/vnd.pypi.simple.v1+json"
+
+    @patch("workman.deps._fetch")
+    def test_skips_yanked_versions(self, mock_fetch):
+        mock_fetch.return_value = _mock_simple_response(
+            ["1.0.0", "1.1.0"], yanked=("1.1.0",),
+        )
+        assert get_latest_version("pkg") == Version("1.0.0")
+
+    @patch("workman.deps._fetch")
+    def test_serves_fresh_cache_without_request(self, mock_fetch):
+        mock_fetch.return_value = _mock_simple_response(["1.0.0"])
+        assert get_latest_version("pkg") == Version("1.0.0")
+
+        mock_fetch.reset_mock()
+        mock_fetch.side_effect = OSError("no network")
+        get_latest_version.cache_clear()
+        assert get_latest_version("pkg") == Version("1.0.0")
+        mock_fetch.assert_not_called()
+
+    @patch("workman.deps._fetch")
+    def test_memoizes_within_process(self, mock_fetch, monkeypatch, tmp_path):
+        mock_fetch.return_value = _mock_simple_response(["1.0.0"])
+        assert get_latest_version("pkg") == Version("1.0.0")
+
+        monkeypatch.setattr("workman.deps.PYPI_CACHE_DIR", tmp_path / "elsewhere")
+        mock_fetch.reset_mock()
+        assert get_latest_version("pkg") == Version("1.0.0")
+        mock_fetch.assert_not_called()
+
+    @patch("workman.deps._fetch")
+    def test_revalidates_stale_cache_with_etag(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = _mock_json_response(
+            {"versions": ["1.0.0"], "files": []}, etag='"abc"',
+        )
+        get_latest_version("pkg")
+
+        # Simulate a later run: drop the in-process memo, age the disk entry
+        get_latest_version.cache_clear()
+        cache_file = tmp_path / ".pypi-cache" / "pkg.json"
+        os.utime(cache_file, (0, 0))
+        mock_fetch.side_effect = urllib.error.HTTPError(
+            "https://pypi.org/simple/pkg/", 304, "Not Modified", {}, None,
+        )
+        assert get_latest_version("pkg") == Version("1.0.0")
+        _, headers = mock_fetch.call_args[0]
+        assert headers["If-None-Match"] == '"abc"'
+        assert cache_file.stat().st_mtime > 0
+
+    @patch("workman.deps._fetch")
+    def test_revalidates_with_last_modified(self, mock_fetch, tmp_path):
+        stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+        mock_fetch.return_value = _mock_json_response(
+            {"versions": ["1.0.0"], "files": []}, last_modified=stamp,
+        )
+        get_latest_version("pkg")
+
+        get_latest_version.cache_clear()
+        os.utime(tmp_path / ".pypi-cache" / "pkg.json", (0, 0))
+        mock_fetch.side_effect = urllib.error.HTTPError(
+            "https://pypi.org/simple/pkg/", 304, "Not Modified", {}, None,
+        )
+        assert get_latest_version("pkg") == Version("1.0.0")
+        _, headers = mock_fetch.call_args[0]
+        assert headers["If-Modified-Since"] == stamp
+
+    @patch("workman.deps._fetch")
+    def test_revalidated_version_survives_utime_failure(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = _mock_json_response(
+            {"versions": ["1.0.0"], "files": []}, etag='"abc"',
+        )
+        get_latest_version("pkg")
+
+        get_latest_version.cache_clear()
+        os.utime(tmp_path / ".pypi-cache" / "pkg.json", (0, 0))
+        mock_fetch.side_effect = urllib.error.HTTPError(
+            "https://pypi.org/simple/pkg/", 304, "Not Modified", {}, None,
+        )
+        with patch("workman.deps.os.utime", side_effect=PermissionError):
+            assert get_latest_version("pkg") == Version("1.0.0")
+
+    @patch("workman.deps._fetch")
+    def test_returns_none_on_network_error(self, mock_fetch):
+        mock_fetch.side_effect = OSError("no network")
         assert get_latest_version("requests") is None
 
-    @patch("workman.deps.urllib.request.urlopen")
-    def test_returns_none_on_bad_json(self, mock_urlopen):
-        class FakeResponse:
-            def read(self):
-                return b"not json"
-            def __enter__(self):
-                return self
-            def __exit__(self, *args):
-                pass
-
-        mock_urlopen.return_value = FakeResponse()
+    @patch("workman.deps._fetch")
+    def test_returns_none_on_bad_json(self, mock_fetch):
+        mock_fetch.return_value = (b"not json", None, None)
         assert get_latest_version("requests") is None
 
 
+class TestFetch:
+    @pytest.fixture(autouse=True)
+    def _fake_connections(self, monkeypatch):
+        monkeypatch.setattr("workman.deps._http_local", threading.local())
+        monkeypatch.setattr("workman.deps.http.client.HTTPSConnection", _FakeHTTPSConnection)
+        _FakeHTTPSConnection.instances = []
+        _FakeHTTPSConnection.responses = []
+
+    def test_reuses_connection(self):
+        _FakeHTTPSConnection.responses = [
+            _FakeHTTPResponse(200, b"a", {"ETag": '"1"'}),
+            _FakeHTTPResponse(200, b"b"),
+        ]
+        assert _fetch("https://pypi.org/simple/a/", {}) == (b"a", '"1"', None)
+        assert _fetch("https://pypi.org/simple/b/", {}) == (b"b", None, None)
+        (conn,) = _FakeHTTPSConnection.instances
+        assert conn.host == "pypi.org"
+        assert [target for _, target, _ in conn.requests] == ["/simple/a/", "/simple/b/"]
+
+    def test_reconnects_after_stale_connection(self):
+        _FakeHTTPSConnection.responses = [
+            _FakeHTTPResponse(200, b"a"),
+            http.client.RemoteDisconnected("closed"),
+            _FakeHTTPResponse(200, b"b"),
+        ]
+        _fetch("https://pypi.org/simple/a/", {})
+        assert _fetch("https://pypi.org/simple/b/", {})[0] == b"b"
+        first, second = _FakeHTTPSConnection.instances
+        assert first.closed
+
+    def test_raises_http_error_on_not_modified(self):
+        _FakeHTTPSConnection.responses = [_FakeHTTPResponse(304)]
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _fetch("https://pypi.org/simple/a/", {"If-None-Match": '"1"'})
+        assert exc.value.code == 304
+
+
 class TestFindOutdated:
     @patch("workman.deps.get_latest_version")
     def test_detects_outdated(self, mock_latest):
@@ -288,6 +614,16 @@ class TestFindOutdated:
         assert "pydantic" in result
         assert result["pydantic"].simple is False
 
+    @patch("workman.deps.get_latest_version")
+    def test_scan_prefetches_each_package_once(self, mock_latest, tmp_path):
+        mock_latest.return_value = Version("2.32.3")
+        _make_project(tmp_path, "a", main=["requests>=2.28.0", "click"])
+        _make_project(tmp_path, "b", main=["requests>=2.31.0"])
+        packages, result = scan_and_find_outdated(tmp_path)
+        assert packages["requests"] == {"a": ">=2.28.0", "b": ">=2.31.0"}
+        assert result["requests"].current_min == Version("2.31.0")
+        mock_latest.assert_called_once_with("requests")
+
 
 class TestUpgradeDependencies:
     @patch("workman.deps.get_latest_version")
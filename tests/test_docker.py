@@ -0,0 +1,155 @@
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+
+import click
+import pytest
+
+from workman.config import ImageConfig, ProjectConfig, WorkspaceConfig
+from workman.docker import (
+    _bake_target_name,
+    _for_each_project,
+    _parse_date_tag,
+    build_images,
+)
+
+
+def _workspace(tmp_path: Path, image: str) -> WorkspaceConfig:
+    proj = ProjectConfig(name="app", path=tmp_path / "app", images=[ImageConfig(name=image)])
+    return WorkspaceConfig(root=tmp_path, projects={"app": proj})
+
+
+def _build(ws: WorkspaceConfig, local: dict[str, list[str]]) -> tuple[list[list[str]], list[str]]:
+    """Run build_images with docker stubbed out; return (build commands, pulled refs)."""
+    known = defaultdict(list, {name: list(tags) for name, tags in local.items()})
+    cmds: list[list[str]] = []
+    pulled: list[str] = []
+
+    def run(cmd, out):
+        cmds.append(cmd)
+        return 0
+
+    with (
+        patch("workman.docker._get_known_tags", return_value=(known, local)),
+        patch("workman.docker._run", side_effect=run),
+        patch("workman.docker._pull_cache_image", side_effect=pulled.append),
+    ):
+        build_images(ws, ())
+    return cmds, pulled
+
+
+class TestBuildImagesCacheFrom:
+    @pytest.fixture(autouse=True)
+    def _sequential(self, monkeypatch):
+        monkeypatch.setenv("WORKMAN_MAX_PARALLEL", "1")
+
+    def test_classic_builder_pulls_missing_cache_image(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("DOCKER_BUILDKIT", raising=False)
+        cmds, pulled = _build(_workspace(tmp_path, "reg.io/team/app"), {})
+
+        assert pulled == ["reg.io/team/app:latest"]
+        (cmd,) = cmds
+        assert cmd[cmd.index("--cache-from") + 1] == "reg.io/team/app:latest"
+        assert "--cache-to" not in cmd
+
+    def test_classic_builder_skips_pull_when_local(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("DOCKER_BUILDKIT", raising=False)
+        cmds, pulled = _build(
+            _workspace(tmp_path, "reg.io/team/app"), {"reg.io/team/app": ["latest"]},
+        )
+
+        assert pulled == []
+        assert "--cache-from" in cmds[0]
+
+    def test_buildkit_never_pulls(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DOCKER_BUILDKIT", "1")
+        cmds, pulled = _build(_workspace(tmp_path, "reg.io/team/app"), {})
+
+        assert pulled == []
+        (cmd,) = cmds
+        assert cmd[cmd.index("--cache-from") + 1] == "reg.io/team/app:latest"
+        assert cmd[cmd.index("--cache-to") + 1] == "type=inline"
+
+
+class TestParseDateTag:
+    def test_valid(self):
+        assert _parse_date_tag("20250101-3") == ("20250101", 3)
+
+    def test_multi_digit_counter(self):
+        assert _parse_date_tag("20250101-12") == ("20250101", 12)
+
+    def test_wrong_date_length(self):
+        assert _parse_date_tag("2025011-1") is None
+        assert _parse_date_tag("202501011-1") is None
+
+    def test_non_digit_date(self):
+        assert _parse_date_tag("2025O101-1") is None
+
+    def test_missing_counter(self):
+        assert _parse_date_tag("20250101") is None
+
+    def test_empty_counter(self):
+        assert _parse_date_tag("20250101-") is None
+
+    def test_non_digit_counter(self):
+        assert _parse_date_tag("20250101-rc1") is None
+
+    def test_latest(self):
+        assert _parse_date_tag("latest") is None
+
+
+class TestBakeTargetName:
+    def test_replaces_non_alphanumeric(self):
+        assert _bake_target_name("reg.io/team/app", set()) == "reg_io_team_app"
+
+    def test_keeps_dashes_and_underscores(self):
+        assert _bake_target_name("my-app_v2", set()) == "my-app_v2"
+
+    def test_collisions_get_a_suffix(self):
+        taken: set[str] = set()
+        assert _bake_target_name("team/app", taken) == "team_app"
+        assert _bake_target_name("team.app", taken) == "team_app_2"
+        assert _bake_target_name("team:app", taken) == "team_app_3"
+        assert taken == {"team_app", "team_app_2", "team_app_3"}
+
+
+class TestForEachProject:
+    @pytest.fixture(autouse=True)
+    def _parallel(self, monkeypatch):
+        monkeypatch.setenv("WORKMAN_MAX_PARALLEL", "4")
+
+    @staticmethod
+    def _projects(tmp_path: Path, *names: str) -> list[ProjectConfig]:
+        return [ProjectConfig(name=n, path=tmp_path / n) for n in names]
+
+    def test_output_in_project_order(self, tmp_path, capsys):
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+
+        def worker(proj, out):
+            time.sleep(delays[proj.name])
+            out.write(f"{proj.name}\n")
+            return proj.name
+
+        results = _for_each_project(self._projects(tmp_path, "a", "b", "c"), worker)
+        assert results == ["a", "b", "c"]
+        assert capsys.readouterr().out == "a\nb\nc\n"
+
+    def test_first_failure_reraised_after_others_finish(self, tmp_path, monkeypatch, capsys):
+        # Fewer workers than projects, so "d" is still queued when "b" fails
+        monkeypatch.setenv("WORKMAN_MAX_PARALLEL", "2")
+        finished: list[str] = []
+
+        def worker(proj, out):
+            out.write(f"{proj.name}\n")
+            if proj.name in ("b", "c"):
+                raise click.ClickException(f"{proj.name} failed")
+            time.sleep(0.02)
+            finished.append(proj.name)
+
+        projects = self._projects(tmp_path, "a", "b", "c", "d")
+        with pytest.raises(click.ClickException, match="b failed"):
+            _for_each_project(projects, worker)
+
+        assert sorted(finished) == ["a", "d"]
+        assert capsys.readouterr().out == "a\nb\nc\nd\n"
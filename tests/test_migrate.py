@@ -1,7 +1,11 @@
+import configparser
+import os
 import tomllib
 from pathlib import Path
 from textwrap import dedent
+from unittest.mock import patch
 
+import click
 import pytest
 
 from workman.migrate import (
@@ -25,6 +29,13 @@ from workman.migrate import (
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _isolated_setup_py_cache(tmp_path_factory, monkeypatch):
+    monkeypatch.setattr(
+        "workman.migrate.SETUP_PY_CACHE_DIR", tmp_path_factory.mktemp("setup-py-cache"),
+    )
+
+
 def _write(path: Path, content: str) -> None:
     path.write_text(dedent(content))
 
@@ -108,11 +119,21 @@ class TestParseSetupPy:
 
     def test_no_setup_call(self, tmp_path):
         (tmp_path / "setup.py").write_text("print('hello')\n")
-        meta = parse_setup_py(tmp_path / "setup.py")
+        with patch("workman.migrate.ast.parse") as mock_parse:
+            meta = parse_setup_py(tmp_path / "setup.py")
+        mock_parse.assert_not_called()
         assert any("no setup() call" in w for w in meta.warnings)
 
+    def test_spaced_setup_call(self, tmp_path):
+        (tmp_path / "setup.py").write_text(
+            "import setuptools\n"
+            "setuptools . setup (\n    name='myapp',\n)\n"
+        )
+        meta = parse_setup_py(tmp_path / "setup.py")
+        assert meta.name == "myapp"
+
     def test_syntax_error(self, tmp_path):
-        (tmp_path / "setup.py").write_text("def broken(\n")
+        (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup(\n")
         meta = parse_setup_py(tmp_path / "setup.py")
         assert any("could not parse" in w for w in meta.warnings)
 
@@ -125,6 +146,45 @@ class TestParseSetupPy:
         assert meta.name == "myapp"
         assert meta.version == "2.0"
 
+    def test_setup_under_main_guard(self, tmp_path):
+        (tmp_path / "setup.py").write_text(
+            "from setuptools import setup\n"
+            "if __name__ == '__main__':\n"
+            "    setup(name='myapp')\n"
+        )
+        meta = parse_setup_py(tmp_path / "setup.py")
+        assert meta.name == "myapp"
+
+    def test_reuses_parse_of_unchanged_file(self, tmp_path):
+        _make_setup_py(tmp_path, name="myapp", version="1.0")
+        parse_setup_py(tmp_path / "setup.py")
+        with patch("workman.migrate.ast.parse") as mock_parse:
+            meta = parse_setup_py(tmp_path / "setup.py")
+        mock_parse.assert_not_called()
+        assert meta.name == "myapp"
+
+    def test_reuses_cached_metadata_across_runs(self, tmp_path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.mkdir()
+        b.mkdir()
+        _make_setup_py(a, name="myapp", version="1.0", install_requires=["click"])
+        _make_setup_py(b, name="myapp", version="1.0", install_requires=["click"])
+        first = parse_setup_py(a / "setup.py")
+        # Same source at a different path: served from the on-disk cache
+        with patch("workman.migrate.ast.parse") as mock_parse:
+            second = parse_setup_py(b / "setup.py")
+        mock_parse.assert_not_called()
+        assert second == first
+
+    def test_reparses_changed_file(self, tmp_path):
+        path = tmp_path / "setup.py"
+        _make_setup_py(tmp_path, name="myapp", version="1.0")
+        parse_setup_py(path)
+        _make_setup_py(tmp_path, name="myapp", version="2.0")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert parse_setup_py(path).version == "2.0"
+
 
 # ---------------------------------------------------------------------------
 # parse_setup_cfg
@@ -185,6 +245,57 @@ class TestParseSetupCfg:
         assert meta.name is None
         assert meta.dependencies == []
 
+    def test_plain_file_skips_configparser(self, tmp_path):
+        _write(tmp_path / "setup.cfg", """\
+            [metadata]
+            Name: myapp
+            # a comment
+            [options]
+            install_requires =
+                click>=8.0
+
+                requests>=2.28
+            """)
+        with patch("workman.migrate.configparser.ConfigParser.read_string") as mock_read:
+            meta = parse_setup_cfg(tmp_path / "setup.cfg")
+        mock_read.assert_not_called()
+        assert meta.name == "myapp"
+        assert meta.dependencies == ["click>=8.0", "requests>=2.28"]
+
+    def test_interpolation_falls_back_to_configparser(self, tmp_path):
+        _make_setup_cfg(tmp_path, {
+            "metadata": {"name": "myapp", "version": "1.0", "description": "%(name)s v%(version)s"},
+        })
+        meta = parse_setup_cfg(tmp_path / "setup.cfg")
+        assert meta.description == "myapp v1.0"
+
+    def test_reused_parser_is_reset(self, tmp_path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.mkdir()
+        b.mkdir()
+        _make_setup_cfg(a, {"DEFAULT": {"version": "9.9"}, "metadata": {"name": "a"}})
+        _make_setup_cfg(b, {"options": {"python_requires": ">=3.10"}})
+        cfg = configparser.ConfigParser()
+        assert parse_setup_cfg(a / "setup.cfg", cfg).version == "9.9"
+        meta = parse_setup_cfg(b / "setup.cfg", cfg)
+        assert meta.name is None
+        assert meta.version is None
+        assert meta.requires_python == ">=3.10"
+
+    def test_pooled_parser_is_reset(self, tmp_path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.mkdir()
+        b.mkdir()
+        _make_setup_cfg(a, {"DEFAULT": {"version": "9.9"}, "metadata": {"name": "a"}})
+        _make_setup_cfg(b, {"DEFAULT": {"x": "1"}, "options": {"python_requires": ">=3.10"}})
+        assert parse_setup_cfg(a / "setup.cfg").version == "9.9"
+        with patch("workman.migrate.configparser.ConfigParser") as mock_cls:
+            meta = parse_setup_cfg(b / "setup.cfg")
+        mock_cls.assert_not_called()
+        assert meta.name is None
+        assert meta.version is None
+        assert meta.requires_python == ">=3.10"
+
 
 # ---------------------------------------------------------------------------
 # parse_requirements_txt
@@ -238,6 +349,17 @@ class TestParseRequirementsTxt:
         assert "click" in meta.dependencies
         assert "requests" in meta.dependencies
 
+    def test_reuses_result_until_include_changes(self, tmp_path):
+        (tmp_path / "base.txt").write_text("click>=8.0\n")
+        (tmp_path / "requirements.txt").write_text("-r base.txt\nrequests\n")
+        path = tmp_path / "requirements.txt"
+        meta = parse_requirements_txt(path)
+        meta.dependencies.append("mutated")  # callers get their own copy
+        assert parse_requirements_txt(path).dependencies == ["click>=8.0", "requests"]
+
+        (tmp_path / "base.txt").write_text("click>=8.1.7\n")
+        assert parse_requirements_txt(path).dependencies == ["click>=8.1.7", "requests"]
+
 
 # ---------------------------------------------------------------------------
 # parse_existing_pyproject
@@ -305,6 +427,14 @@ class TestMergeMetadata:
         merged = merge_metadata([high, low])
         assert merged.dependencies == ["click>=8.0"]
 
+    def test_deps_deduplicated_in_order(self):
+        src = ProjectMetadata(
+            dependencies=["click>=8.0", "flask", "click>=8.0"], sources=["requirements.txt"],
+        )
+        merged = merge_metadata([src])
+        assert merged.dependencies == ["click>=8.0", "flask"]
+        assert src.dependencies == ["click>=8.0", "flask", "click>=8.0"]
+
     def test_optional_deps_merged(self):
         high = ProjectMetadata(
             optional_dependencies={"dev": ["pytest"]}, sources=["setup.cfg"],
@@ -352,6 +482,14 @@ class TestDeepMerge:
         assert result["project"]["name"] == "myapp"
         assert result["project"]["version"] == "1.0"
 
+    def test_inputs_not_modified(self):
+        base = {"tool": {"a": {"x": 1}}}
+        overlay = {"tool": {"a": {"y": 2}, "b": {}}}
+        result = _deep_merge(base, overlay)
+        assert result == {"tool": {"a": {"x": 1, "y": 2}, "b": {}}}
+        assert base == {"tool": {"a": {"x": 1}}}
+        assert overlay == {"tool": {"a": {"y": 2}, "b": {}}}
+
 
 # ---------------------------------------------------------------------------
 # build_pyproject_dict
@@ -401,6 +539,51 @@ class TestWritePyproject:
             result = tomllib.load(f)
         assert result["project"]["name"] == "myapp"
 
+    def test_generated_document_matches_tomli_w(self, tmp_path):
+        import tomli_w
+
+        meta = ProjectMetadata(
+            name="myapp",
+            description='A "quoted" \\ description',
+            dependencies=["requests>=2.0"],
+            optional_dependencies={"dev": ["pytest"], "docs.extra": []},
+            entry_points={"myapp": "myapp.cli:main"},
+        )
+        data = build_pyproject_dict(meta, "myapp")
+        write_pyproject(tmp_path, data)
+        assert (tmp_path / "pyproject.toml").read_text() == tomli_w.dumps(data)
+
+    def test_falls_back_for_other_documents(self, tmp_path):
+        data = {
+            "project": {"name": "myapp", "description": "two\nlines"},
+            "tool": {"ruff": {"line-length": 100}},
+        }
+        write_pyproject(tmp_path, data)
+        with open(tmp_path / "pyproject.toml", "rb") as f:
+            assert tomllib.load(f) == data
+
+    def test_failed_write_keeps_existing(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text('[project]\nname = "myapp"\n')
+        with pytest.raises(TypeError):
+            write_pyproject(tmp_path, {"project": {"version": object()}})
+        assert (tmp_path / "pyproject.toml").read_text() == '[project]\nname = "myapp"\n'
+        assert [p.name for p in tmp_path.iterdir()] == ["pyproject.toml"]
+
+    def test_keeps_symlink_and_mode(self, tmp_path):
+        target = tmp_path / "shared.toml"
+        target.write_text('[project]\nname = "myapp"\n')
+        target.chmod(0o600)
+        proj = tmp_path / "myapp"
+        proj.mkdir()
+        (proj / "pyproject.toml").symlink_to(target)
+
+        write_pyproject(proj, {"project": {"version": "1.0"}})
+
+        assert (proj / "pyproject.toml").is_symlink()
+        assert target.stat().st_mode & 0o777 == 0o600
+        with open(target, "rb") as f:
+            assert tomllib.load(f)["project"] == {"name": "myapp", "version": "1.0"}
+
     def test_merges_with_existing(self, tmp_path):
         import tomli_w
 
@@ -424,6 +607,19 @@ class TestWritePyproject:
         # New values filled in
         assert result["project"]["version"] == "1.0"
 
+    def test_merges_with_given_existing(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text('[project]\nname = "stale"\n')
+        existing = {"project": {"name": "myapp"}}
+
+        with patch("workman.migrate._load_toml") as mock_load:
+            write_pyproject(tmp_path, {"project": {"version": "1.0"}}, existing)
+        mock_load.assert_not_called()
+
+        with open(tmp_path / "pyproject.toml", "rb") as f:
+            result = tomllib.load(f)
+        assert result["project"] == {"name": "myapp", "version": "1.0"}
+        assert existing == {"project": {"name": "myapp"}}
+
 
 # ---------------------------------------------------------------------------
 # migrate_project (integration)
@@ -552,6 +748,46 @@ class TestMigrateProjects:
         for name in ["svc-a", "svc-b"]:
             assert (tmp_path / name / "pyproject.toml").exists()
 
+    def test_large_workspace_uses_processes(self, tmp_path, monkeypatch, capsys):
+        for name in ["svc-a", "svc-b"]:
+            proj = tmp_path / name
+            proj.mkdir()
+            _make_setup_py(proj, name=name, version="1.0")
+        monkeypatch.setattr("workman.migrate.MIGRATE_PROCESS_THRESHOLD", 1)
+        monkeypatch.setattr("workman.migrate.os.cpu_count", lambda: 2)
+        # Spawned workers import workman afresh; keep their cache in tmp too
+        monkeypatch.setenv("WORKMAN_CACHE_DIR", str(tmp_path / ".cache"))
+
+        migrate_projects(tmp_path, None)
+
+        for name in ["svc-a", "svc-b"]:
+            data = tomllib.loads((tmp_path / name / "pyproject.toml").read_text())
+            assert data["project"]["name"] == name
+        assert "Migrated 2 project(s)" in capsys.readouterr().out
+
+    def test_failure_reports_other_projects(self, tmp_path, capsys):
+        for name in ["svc-a", "svc-b", "svc-c"]:
+            proj = tmp_path / name
+            proj.mkdir()
+            _make_setup_py(proj, name=name, version="1.0")
+
+        real_migrate_project = migrate_project
+
+        def flaky(project_dir, **kwargs):
+            if project_dir.name == "svc-b":
+                raise OSError("disk full")
+            return real_migrate_project(project_dir, **kwargs)
+
+        with patch("workman.migrate.migrate_project", flaky):
+            with pytest.raises(click.ClickException, match="svc-b"):
+                migrate_projects(tmp_path, None, clean=True)
+
+        out = capsys.readouterr().out
+        assert out.count("wrote pyproject.toml") == 2
+        assert out.count("removed: setup.py") == 2
+        assert "disk full" in out
+        assert "Migrated 2 project(s). 0 skipped. 1 failed." in out
+
     def test_project_name_filter(self, tmp_path):
         for name in ["svc-a", "svc-b"]:
             proj = tmp_path / name